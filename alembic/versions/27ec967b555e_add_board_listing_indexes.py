@@ -0,0 +1,38 @@
+"""add board listing indexes
+
+Revision ID: 27ec967b555e
+Revises: e7d593a912c5
+Create Date: 2026-10-18 10:41:55.730162
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27ec967b555e'
+down_revision: Union[str, None] = 'e7d593a912c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_boards_difficulty_created_at',
+        'boards',
+        ['difficulty', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_boards_created_at_id',
+        'boards',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_boards_created_at_id', table_name='boards')
+    op.drop_index('ix_boards_difficulty_created_at', table_name='boards')
@@ -0,0 +1,31 @@
+"""drop board packed columns
+
+Revision ID: 4f1d0b6a9c2e
+Revises: 8cd07db93568
+Create Date: 2026-10-18 16:42:17.513208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d0b6a9c2e'
+down_revision: Union[str, None] = '8cd07db93568'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The compact format packs on read; storing both forms only grew rows.
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.drop_column('solution_packed')
+        batch_op.drop_column('initial_packed')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.add_column(sa.Column('initial_packed', sa.LargeBinary(length=41), nullable=True))
+        batch_op.add_column(sa.Column('solution_packed', sa.LargeBinary(length=34), nullable=True))
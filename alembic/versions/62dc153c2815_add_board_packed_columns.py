@@ -0,0 +1,59 @@
+"""add board packed columns
+
+Revision ID: 62dc153c2815
+Revises: 27ec967b555e
+Create Date: 2026-10-18 11:20:04.318276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62dc153c2815'
+down_revision: Union[str, None] = '27ec967b555e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('boards', sa.Column('initial_packed', sa.LargeBinary(length=41), nullable=True))
+    op.add_column('boards', sa.Column('solution_packed', sa.LargeBinary(length=34), nullable=True))
+
+    from app.sudoku.codec import pack_board, pack_solution
+
+    boards = sa.table(
+        'boards',
+        sa.column('id', sa.UUID()),
+        sa.column('initial_board', sa.String()),
+        sa.column('solution_board', sa.String()),
+        sa.column('initial_packed', sa.LargeBinary()),
+        sa.column('solution_packed', sa.LargeBinary()),
+    )
+    conn = op.get_bind()
+    while True:
+        rows = conn.execute(
+            sa.select(boards.c.id, boards.c.initial_board, boards.c.solution_board)
+            .where(boards.c.initial_packed.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for board_id, initial_board, solution_board in rows:
+            conn.execute(
+                boards.update()
+                .where(boards.c.id == board_id)
+                .values(
+                    initial_packed=pack_board(initial_board),
+                    solution_packed=pack_solution(solution_board),
+                )
+            )
+
+
+def downgrade() -> None:
+    op.drop_column('boards', 'solution_packed')
+    op.drop_column('boards', 'initial_packed')
@@ -0,0 +1,82 @@
+"""add board canonical hash
+
+Revision ID: 8cd07db93568
+Revises: 98fa760bf76b
+Create Date: 2026-10-18 13:15:09.620481
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8cd07db93568'
+down_revision: Union[str, None] = '98fa760bf76b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.add_column(sa.Column('canonical_hash', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('duplicate_of_id', sa.UUID(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_boards_duplicate_of_id_boards', 'boards', ['duplicate_of_id'], ['id']
+        )
+
+    from app.sudoku.canonical import canonical_form
+
+    boards = sa.table(
+        'boards',
+        sa.column('id', sa.UUID()),
+        sa.column('initial_board', sa.String()),
+        sa.column('created_at', sa.DateTime()),
+        sa.column('canonical_hash', sa.BigInteger()),
+        sa.column('duplicate_of_id', sa.UUID()),
+    )
+    conn = op.get_bind()
+    # Walk boards oldest first so the earliest of each equivalence class is
+    # the one the others link to.
+    originals = {}
+    last = None
+    while True:
+        query = (
+            sa.select(boards.c.id, boards.c.initial_board, boards.c.created_at)
+            .order_by(boards.c.created_at, boards.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last is not None:
+            query = query.where(
+                sa.tuple_(boards.c.created_at, boards.c.id) > sa.tuple_(*last)
+            )
+        rows = conn.execute(query).all()
+        if not rows:
+            break
+        for board_id, initial_board, created_at in rows:
+            canonical = canonical_form(initial_board)
+            if canonical is None:
+                continue
+            original = originals.setdefault(canonical.board, board_id)
+            conn.execute(
+                boards.update()
+                .where(boards.c.id == board_id)
+                .values(
+                    canonical_hash=canonical.hash,
+                    duplicate_of_id=None if original == board_id else original,
+                )
+            )
+        last = (rows[-1].created_at, rows[-1].id)
+
+    op.create_index(op.f('ix_boards_canonical_hash'), 'boards', ['canonical_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_boards_canonical_hash'), table_name='boards')
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.drop_constraint('fk_boards_duplicate_of_id_boards', type_='foreignkey')
+        batch_op.drop_column('duplicate_of_id')
+        batch_op.drop_column('canonical_hash')
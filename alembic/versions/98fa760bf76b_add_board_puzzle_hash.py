@@ -0,0 +1,55 @@
+"""add board puzzle hash
+
+Revision ID: 98fa760bf76b
+Revises: 62dc153c2815
+Create Date: 2026-10-18 12:02:47.906113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '98fa760bf76b'
+down_revision: Union[str, None] = '62dc153c2815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('boards', sa.Column('puzzle_hash', sa.BigInteger(), nullable=True))
+
+    from app.sudoku.codec import puzzle_hash
+
+    boards = sa.table(
+        'boards',
+        sa.column('id', sa.UUID()),
+        sa.column('initial_board', sa.String()),
+        sa.column('puzzle_hash', sa.BigInteger()),
+    )
+    conn = op.get_bind()
+    while True:
+        rows = conn.execute(
+            sa.select(boards.c.id, boards.c.initial_board)
+            .where(boards.c.puzzle_hash.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for board_id, initial_board in rows:
+            conn.execute(
+                boards.update()
+                .where(boards.c.id == board_id)
+                .values(puzzle_hash=puzzle_hash(initial_board))
+            )
+
+    op.create_index(op.f('ix_boards_puzzle_hash'), 'boards', ['puzzle_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_boards_puzzle_hash'), table_name='boards')
+    op.drop_column('boards', 'puzzle_hash')
@@ -0,0 +1,79 @@
+"""add board grading columns
+
+Revision ID: cc243073bc9f
+Revises: 191cc9557573
+Create Date: 2026-10-18 09:12:41.205733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cc243073bc9f'
+down_revision: Union[str, None] = '191cc9557573'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('boards', sa.Column('rating', sa.Integer(), nullable=True))
+    op.add_column('boards', sa.Column('technique', sa.String(length=32), nullable=True))
+    op.add_column('boards', sa.Column('steps', sa.Integer(), nullable=True))
+    op.add_column('boards', sa.Column('clue_count', sa.Integer(), nullable=True))
+    op.add_column('boards', sa.Column('search_nodes', sa.Integer(), nullable=True))
+
+    # Grade existing boards once so reads never have to.
+    from app.sudoku.grader import grade_puzzle
+
+    boards = sa.table(
+        'boards',
+        sa.column('id', sa.UUID()),
+        sa.column('initial_board', sa.String()),
+        sa.column('rating', sa.Integer()),
+        sa.column('technique', sa.String()),
+        sa.column('steps', sa.Integer()),
+        sa.column('clue_count', sa.Integer()),
+        sa.column('search_nodes', sa.Integer()),
+    )
+    conn = op.get_bind()
+    while True:
+        rows = conn.execute(
+            sa.select(boards.c.id, boards.c.initial_board)
+            .where(boards.c.rating.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for board_id, initial_board in rows:
+            grade = grade_puzzle(initial_board)
+            conn.execute(
+                boards.update()
+                .where(boards.c.id == board_id)
+                .values(
+                    rating=grade.rating,
+                    technique=str(grade.technique),
+                    steps=grade.steps,
+                    clue_count=grade.clues,
+                    search_nodes=grade.search_nodes,
+                )
+            )
+
+    op.create_index(op.f('ix_boards_rating'), 'boards', ['rating'], unique=False)
+    op.create_index(op.f('ix_boards_clue_count'), 'boards', ['clue_count'], unique=False)
+    op.create_index(op.f('ix_boards_search_nodes'), 'boards', ['search_nodes'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_boards_search_nodes'), table_name='boards')
+    op.drop_index(op.f('ix_boards_clue_count'), table_name='boards')
+    op.drop_index(op.f('ix_boards_rating'), table_name='boards')
+    op.drop_column('boards', 'search_nodes')
+    op.drop_column('boards', 'clue_count')
+    op.drop_column('boards', 'steps')
+    op.drop_column('boards', 'technique')
+    op.drop_column('boards', 'rating')
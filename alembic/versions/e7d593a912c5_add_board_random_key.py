@@ -0,0 +1,44 @@
+"""add board random key
+
+Revision ID: e7d593a912c5
+Revises: cc243073bc9f
+Create Date: 2026-10-18 10:03:27.518904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d593a912c5'
+down_revision: Union[str, None] = 'cc243073bc9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('boards', sa.Column('random_key', sa.Float(), nullable=True))
+
+    # Backfill with a uniform value in [0, 1).
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('UPDATE boards SET random_key = random()')
+    else:
+        # SQLite's random() is a signed 64-bit integer; scale it into [0, 1).
+        op.execute(
+            'UPDATE boards SET random_key = '
+            '(random() / 18446744073709551616.0) + 0.5'
+        )
+
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.alter_column('random_key', existing_type=sa.Float(), nullable=False)
+    op.create_index(
+        'ix_boards_difficulty_random_key', 'boards', ['difficulty', 'random_key'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_boards_difficulty_random_key', table_name='boards')
+    with op.batch_alter_table('boards') as batch_op:
+        batch_op.drop_column('random_key')
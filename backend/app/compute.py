@@ -0,0 +1,43 @@
+# api/app/compute.py
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+
+class ComputeService:
+    """Runs CPU-bound sudoku work (generation, solving) off the event loop.
+
+    Work goes to a process pool so a long generation never holds the GIL of the
+    worker serving other requests. With no pool started (``workers == 0`` or
+    outside the app lifespan) calls fall back to Starlette's threadpool.
+    """
+
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self, workers: int) -> None:
+        if workers > 0 and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pool is None:
+            return await run_in_threadpool(fn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(fn, *args))
+
+
+compute = ComputeService()
@@ -0,0 +1,267 @@
+# api/app/corpus.py
+import argparse
+import mmap
+import random
+import struct
+import sys
+import uuid
+from bisect import bisect_left, bisect_right
+from typing import BinaryIO, Dict, Iterable, Iterator, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import nulls_last, select
+from sqlalchemy.engine import Engine
+
+from . import models
+from .database import engine as default_engine
+from .models import Difficulty
+from .sudoku.codec import (
+    PACKED_BOARD_SIZE,
+    PACKED_SOLUTION_SIZE,
+    pack_board,
+    pack_solution,
+    unpack_board,
+    unpack_solution,
+)
+
+# File layout: a fixed header, then one fixed-width record per board. Records
+# are grouped by difficulty and sorted by rating inside each group; the header
+# holds each group's (first record, count).
+MAGIC = b"SDKC"
+VERSION = 1
+DIFFICULTIES = list(Difficulty)
+HEADER = struct.Struct("<4sHH" + "QQ" * len(DIFFICULTIES))
+HEADER_SIZE = 128
+# id, packed puzzle, packed solution, difficulty, rating (NO_RATING if unset)
+RECORD = struct.Struct(f"<16s{PACKED_BOARD_SIZE}s{PACKED_SOLUTION_SIZE}sBB")
+NO_RATING = 0xFF
+_PUZZLE_AT = 16
+_SOLUTION_AT = _PUZZLE_AT + PACKED_BOARD_SIZE
+_DIFFICULTY_AT = _SOLUTION_AT + PACKED_SOLUTION_SIZE
+_RATING_AT = _DIFFICULTY_AT + 1
+
+
+class CorpusRecord(NamedTuple):
+    index: int
+    id: uuid.UUID
+    difficulty: Difficulty
+    initial_board: str
+    solution_board: str
+    rating: int | None
+
+
+class CorpusError(Exception):
+    pass
+
+
+class Corpus:
+    """Read-only, memory-mapped board corpus.
+
+    Records are sliced straight out of the mapping: a read costs one page
+    fault at worst, and the only objects built are the returned fields.
+    Every worker maps the same file, so the OS shares one copy of the pages.
+    """
+
+    def __init__(self):
+        self._file: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        self._groups: Dict[Difficulty, Tuple[int, int]] = {}
+        self.size = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._map is not None
+
+    def open(self, path: str) -> None:
+        self.close()
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            self.close()
+            raise CorpusError(f"{path}: not a board corpus") from exc
+        if len(self._map) < HEADER_SIZE:
+            self.close()
+            raise CorpusError(f"{path}: not a board corpus")
+        magic, version, record_size, *index = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise CorpusError(f"{path}: unsupported corpus format")
+        self._groups = {
+            d: (index[2 * k], index[2 * k + 1]) for k, d in enumerate(DIFFICULTIES)
+        }
+        self.size = sum(count for _, count in self._groups.values())
+        if len(self._map) < HEADER_SIZE + self.size * RECORD.size:
+            self.close()
+            raise CorpusError(f"{path}: truncated corpus")
+        self._view = memoryview(self._map)
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._groups = {}
+        self.size = 0
+
+    def counts(self) -> Dict[Difficulty, int]:
+        return {d: count for d, (_, count) in self._groups.items()}
+
+    def _offset(self, index: int) -> int:
+        return HEADER_SIZE + index * RECORD.size
+
+    def _rating(self, index: int) -> int:
+        return self._map[self._offset(index) + _RATING_AT]
+
+    def header(self, index: int) -> Tuple[uuid.UUID, Difficulty, int | None]:
+        """(id, difficulty, rating) of a record."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        at = self._offset(index)
+        rating = self._map[at + _RATING_AT]
+        return (
+            uuid.UUID(bytes=self._map[at : at + _PUZZLE_AT]),
+            DIFFICULTIES[self._map[at + _DIFFICULTY_AT]],
+            None if rating == NO_RATING else rating,
+        )
+
+    def record(self, index: int) -> CorpusRecord:
+        record_id, difficulty, rating = self.header(index)
+        puzzle, solution = self.packed(index)
+        return CorpusRecord(
+            index=index,
+            id=record_id,
+            difficulty=difficulty,
+            initial_board=unpack_board(puzzle),
+            solution_board=unpack_solution(solution),
+            rating=rating,
+        )
+
+    def packed(self, index: int) -> Tuple[memoryview, memoryview]:
+        """(packed puzzle, packed solution) of a record, without copying."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        at = self._offset(index)
+        return (
+            self._view[at + _PUZZLE_AT : at + _SOLUTION_AT],
+            self._view[at + _SOLUTION_AT : at + _DIFFICULTY_AT],
+        )
+
+    def random_index(
+        self,
+        difficulty: Difficulty,
+        min_rating: int | None = None,
+        max_rating: int | None = None,
+    ) -> int | None:
+        """Uniform pick inside one difficulty, or None if nothing matches.
+
+        Ratings are sorted inside a group, so a rating range is two binary
+        searches over the mapped ratings.
+        """
+        start, count = self._groups.get(difficulty, (0, 0))
+        lo, hi = 0, count
+        if min_rating is not None or max_rating is not None:
+            span = range(start, start + count)
+            if min_rating is not None:
+                lo = bisect_left(span, min_rating, key=self._rating)
+            # NO_RATING sorts last, so an open upper bound still excludes it.
+            upper = max_rating if max_rating is not None else NO_RATING - 1
+            hi = bisect_right(span, upper, key=self._rating)
+        if lo >= hi:
+            return None
+        return start + random.randrange(lo, hi)
+
+
+# ---------------- Writer ---------------- #
+class BoardSource(NamedTuple):
+    id: uuid.UUID
+    difficulty: Difficulty
+    initial_board: str
+    solution_board: str
+    rating: int | None
+
+
+def _sort_key(board: BoardSource):
+    rating = NO_RATING if board.rating is None else board.rating
+    return DIFFICULTIES.index(board.difficulty), rating
+
+
+def write_corpus(path: str, boards: Iterable[BoardSource]) -> Dict[Difficulty, int]:
+    """Write ``boards`` as a corpus file; they must arrive in difficulty then
+    rating order (None last), as ``iter_db_boards`` yields them."""
+    groups: Dict[Difficulty, Tuple[int, int]] = {}
+    written = 0
+    last = None
+    with open(path, "wb") as fh:
+        fh.write(bytes(HEADER_SIZE))
+        for board in boards:
+            key = _sort_key(board)
+            if last is not None and key < last:
+                raise CorpusError("boards must be sorted by difficulty and rating")
+            last = key
+            start, count = groups.get(board.difficulty, (written, 0))
+            groups[board.difficulty] = (start, count + 1)
+            fh.write(
+                RECORD.pack(
+                    board.id.bytes,
+                    pack_board(board.initial_board),
+                    pack_solution(board.solution_board),
+                    key[0],
+                    key[1],
+                )
+            )
+            written += 1
+        index = [n for d in DIFFICULTIES for n in groups.get(d, (0, 0))]
+        fh.seek(0)
+        fh.write(HEADER.pack(MAGIC, VERSION, RECORD.size, *index))
+    return {d: count for d, (_, count) in groups.items()}
+
+
+def iter_db_boards(
+    engine: Engine = default_engine, batch_size: int = 1000
+) -> Iterator[BoardSource]:
+    """Stored boards in corpus order, streamed one difficulty at a time.
+
+    Boards linked to an equivalent original are left out.
+    """
+    Board = models.Board
+    columns = (
+        Board.id,
+        Board.difficulty,
+        Board.initial_board,
+        Board.solution_board,
+        Board.rating,
+    )
+    with engine.connect() as conn:
+        for difficulty in DIFFICULTIES:
+            stmt = (
+                select(*columns)
+                .where(Board.difficulty == difficulty, Board.duplicate_of_id.is_(None))
+                .order_by(nulls_last(Board.rating.asc()), Board.id)
+            )
+            rows = conn.execution_options(yield_per=batch_size).execute(stmt)
+            yield from (BoardSource(*row) for row in rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.app.corpus",
+        description="Build a memory-mapped board corpus from the boards table.",
+    )
+    parser.add_argument("output", help="corpus file to write")
+    args = parser.parse_args(argv)
+    counts = write_corpus(args.output, iter_db_boards())
+    for difficulty, count in counts.items():
+        print(f"[corpus] {difficulty.value}: {count}", file=sys.stderr)
+    return 0
+
+
+corpus = Corpus()
+
+if __name__ == "__main__":
+    sys.exit(main())
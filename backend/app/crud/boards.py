@@ -1,36 +1,269 @@
 # api/app/crud/boards.py
+import asyncio
+import random
 import secrets
 import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from .. import models, schemas
+from ..compute import compute
+from ..settings import settings
+from ..sudoku.canonical import Canonical, canonical_form, canonicalize_str, map_solution
+from ..sudoku.codec import puzzle_hash
+from ..sudoku.prepare import GRADE_FIELDS, derived_fields, grade_fields, prepare_boards
+from ..sudoku.solver import is_solution
 
+BULK_CHUNK_SIZE = 1000  # rows per INSERT
+PREPARE_BATCH_SIZE = 100  # rows per compute task
 
-def create_board(db: Session, data: schemas.BoardCreate) -> models.Board:
+
+async def find_equivalent(
+    db: AsyncSession, canonical: Canonical
+) -> Tuple[models.Board, Canonical] | None:
+    """A stored board equivalent to ``canonical``, with its own canonical form."""
+    candidates = await db.scalars(
+        select(models.Board).where(models.Board.canonical_hash == canonical.hash)
+    )
+    for board in candidates:
+        # Recomputing guards against hash collisions and yields the transform.
+        stored = await run_in_threadpool(canonicalize_str, board.initial_board)
+        if stored.board == canonical.board:
+            return board, stored
+    return None
+
+
+async def get_equivalent_solution(db: AsyncSession, puzzle: str) -> str | None:
+    """Solve ``puzzle`` by mapping the solution of a stored equivalent board."""
+    target = await run_in_threadpool(canonical_form, puzzle)
+    found = await find_equivalent(db, target) if target is not None else None
+    if found is None:
+        return None
+    board, source = found
+    solution = map_solution(board.solution_board, source, target)
+    # Stored solutions are only checked against their givens on insert.
+    return solution if is_solution(puzzle, solution) else None
+
+
+async def _dedupe_fields(db: AsyncSession, initial_board: str) -> dict:
+    """canonical_hash, the duplicate link and grades (copied from an equivalent)."""
+    canonical = await run_in_threadpool(canonical_form, initial_board)
+    found = await find_equivalent(db, canonical) if canonical is not None else None
+    if found is None:
+        return {
+            "canonical_hash": canonical.hash if canonical is not None else None,
+            **await run_in_threadpool(grade_fields, initial_board),
+        }
+    original = found[0]
+    if settings.board_duplicates == "reject":
+        raise HTTPException(409, f"Board is equivalent to {original.public_id}")
+    # Symmetries preserve every grading measure, so reuse the stored grade.
+    return {
+        "canonical_hash": canonical.hash,
+        "duplicate_of_id": original.duplicate_of_id or original.id,
+        **{name: getattr(original, name) for name in GRADE_FIELDS},
+    }
+
+
+async def create_board(db: AsyncSession, data: schemas.BoardCreate) -> models.Board:
     board = models.Board(
         public_id=data.public_id,
         difficulty=data.difficulty,
         initial_board=data.initial_board,
         solution_board=data.solution_board,
+        **derived_fields(data.initial_board, data.solution_board),
+        **await _dedupe_fields(db, data.initial_board),
     )
     db.add(board)
-    db.commit()
-    db.refresh(board)
+    await db.commit()
+    await db.refresh(board)
     return board
 
 
-def get_random_board(db: Session, difficulty: models.Difficulty):
-    """Return one random board for the given difficulty."""
-    row = (
-        db.query(models.Board)
-        .filter(models.Board.difficulty == difficulty)
-        .order_by(func.random())
-        .limit(1)
-        .one_or_none()
+# ---------------- Bulk insert ---------------- #
+BulkResult = Tuple[uuid.UUID | None, str | None]  # (inserted id, reject reason)
+
+
+async def _taken_public_ids(db: AsyncSession, public_ids: list[str]) -> set[str]:
+    result = await db.scalars(
+        select(models.Board.public_id).where(models.Board.public_id.in_(public_ids))
+    )
+    return set(result.all())
+
+
+async def _load_originals(
+    db: AsyncSession, canonicals: list[Canonical], originals: dict
+) -> None:
+    """Add stored boards equivalent to ``canonicals`` to ``originals``
+    (canonical board -> (root id, public_id))."""
+    hashes = {c.hash for c in canonicals if c.board not in originals}
+    if not hashes:
+        return
+    stored = await db.execute(
+        select(
+            models.Board.id,
+            models.Board.duplicate_of_id,
+            models.Board.public_id,
+            models.Board.initial_board,
+        ).where(models.Board.canonical_hash.in_(hashes))
+    )
+    for board_id, duplicate_of_id, public_id, initial_board in stored:
+        # Recomputed: a shared hash alone could be a collision.
+        board = (await run_in_threadpool(canonicalize_str, initial_board)).board
+        originals.setdefault(board, (duplicate_of_id or board_id, public_id))
+
+
+def _bulk_row(
+    data: schemas.BoardCreate,
+    fields: dict,
+    canonical: Canonical | None,
+    originals: dict,
+) -> Tuple[dict | None, str | None]:
+    """The row to insert for one board, or why it is rejected."""
+    row = {
+        "id": uuid.uuid4(),
+        "public_id": data.public_id,
+        "difficulty": data.difficulty,
+        "initial_board": data.initial_board,
+        "solution_board": data.solution_board,
+        **fields,
+    }
+    original = originals.get(canonical.board) if canonical is not None else None
+    if original is None:
+        if canonical is not None:
+            originals[canonical.board] = (row["id"], data.public_id)
+    elif settings.board_duplicates == "reject":
+        return None, f"Board is equivalent to {original[1]}"
+    else:
+        row["duplicate_of_id"] = original[0]
+    return row, None
+
+
+async def insert_prepared(
+    db: AsyncSession,
+    chunk: Sequence[Tuple[int, schemas.BoardCreate]],
+    prepared: Sequence[Tuple[dict, Canonical | None]],
+    originals: dict,
+    taken: set[str],
+) -> dict[int, BulkResult]:
+    """Insert one chunk whose columns ``prepare_boards`` already computed.
+
+    Rows only need BoardCreate's four fields, not validated models.
+    ``originals`` and ``taken`` carry what earlier chunks of the same
+    transaction inserted and are updated in place; the caller commits.
+    """
+    taken |= await _taken_public_ids(db, [data.public_id for _, data in chunk])
+    await _load_originals(db, [c for _, c in prepared if c is not None], originals)
+    results: dict[int, BulkResult] = {}
+    rows = []
+    for (index, data), (fields, canonical) in zip(chunk, prepared):
+        if data.public_id in taken:
+            results[index] = (None, f"public_id {data.public_id} already exists")
+            continue
+        row, error = _bulk_row(data, fields, canonical, originals)
+        if row is not None:
+            rows.append(row)
+            taken.add(data.public_id)
+        results[index] = (row["id"] if row else None, error)
+    if rows:
+        await db.execute(insert(models.Board), rows)
+    return results
+
+
+async def _prepare_chunk(
+    chunk: Sequence[Tuple[int, schemas.BoardCreate]], limit: asyncio.Semaphore
+) -> List[Tuple[dict, Canonical | None]]:
+    """``prepare_boards`` for one insert chunk, split into pool-sized tasks."""
+
+    async def prepare(batch):
+        async with limit:
+            return await compute.run(prepare_boards, batch)
+
+    pairs = [(data.initial_board, data.solution_board) for _, data in chunk]
+    batches = await asyncio.gather(
+        *(
+            prepare(pairs[start : start + PREPARE_BATCH_SIZE])
+            for start in range(0, len(pairs), PREPARE_BATCH_SIZE)
+        )
     )
+    return [item for batch in batches for item in batch]
+
+
+async def create_boards(
+    db: AsyncSession, boards: list[Tuple[int, schemas.BoardCreate]]
+) -> dict[int, BulkResult]:
+    """Insert many validated boards in one transaction.
+
+    Rows go out as chunked executemany INSERTs with no per-row refresh. The
+    CPU-bound columns are computed in the compute pool, with every worker
+    busy at once; inserts stay sequential and in request order while later
+    chunks are still being prepared.
+    Returns, per request index, the new id or the reason it was rejected.
+    """
+    results: dict[int, BulkResult] = {}
+    originals: dict = {}
+    taken: set[str] = set()
+    limit = asyncio.Semaphore(max(1, settings.compute_workers))
+    chunks = [
+        boards[start : start + BULK_CHUNK_SIZE]
+        for start in range(0, len(boards), BULK_CHUNK_SIZE)
+    ]
+    tasks = [asyncio.ensure_future(_prepare_chunk(chunk, limit)) for chunk in chunks]
+    try:
+        for chunk, task in zip(chunks, tasks):
+            prepared = await task
+            results.update(await insert_prepared(db, chunk, prepared, originals, taken))
+    finally:
+        for task in tasks:
+            task.cancel()
+    await db.commit()
+    return results
+
+
+async def get_stored_solution(db: AsyncSession, puzzle: str) -> str | None:
+    """Solution of a stored board whose initial_board is exactly ``puzzle``.
+
+    Only a solution that actually solves ``puzzle`` is returned.
+    """
+    result = await db.scalars(
+        select(models.Board.solution_board).where(
+            models.Board.puzzle_hash == puzzle_hash(puzzle),
+            models.Board.initial_board == puzzle,
+        )
+    )
+    for solution in result:
+        if is_solution(puzzle, solution):
+            return solution
+    return None
+
+
+async def get_random_board(
+    db: AsyncSession,
+    difficulty: models.Difficulty,
+    min_rating: int | None = None,
+    max_rating: int | None = None,
+):
+    """Return one random board for the given difficulty (and rating range).
+
+    Probes the (difficulty, random_key) index at a random pivot and wraps
+    around to the smallest key when nothing lies above it, instead of
+    sorting the whole difficulty by random().
+    """
+    stmt = select(models.Board).where(models.Board.difficulty == difficulty)
+    if min_rating is not None:
+        stmt = stmt.where(models.Board.rating >= min_rating)
+    if max_rating is not None:
+        stmt = stmt.where(models.Board.rating <= max_rating)
+    stmt = stmt.order_by(models.Board.random_key).limit(1)
+    pivot = random.random()
+    row = await db.scalar(stmt.where(models.Board.random_key >= pivot))
+    if row is None:
+        row = await db.scalar(stmt)
     if not row:
         raise HTTPException(404, f"No boards for {difficulty}")
     return row
@@ -44,29 +277,72 @@ def is_valid_uuid(uuid_string):
         return False
 
 
-def get_board_all(db: Session):
-    return db.query(models.Board).order_by(models.Board.created_at.desc()).all()
+async def get_board_all(db: AsyncSession):
+    result = await db.scalars(
+        select(models.Board).order_by(models.Board.created_at.desc())
+    )
+    return result.all()
 
 
-def get_board_all_by_level(db: Session, difficulty: str):
-    return (
-        db.query(models.Board)
-        .filter(models.Board.difficulty == difficulty)
+async def get_board_all_by_level(db: AsyncSession, difficulty: str):
+    result = await db.scalars(
+        select(models.Board)
+        .where(models.Board.difficulty == difficulty)
         .order_by(models.Board.created_at.desc())
-        .all()
     )
+    return result.all()
+
+
+async def get_board_page(
+    db: AsyncSession,
+    limit: int,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    difficulty: models.Difficulty | None = None,
+) -> list[models.Board]:
+    """Newest-first page of boards strictly after the ``(created_at, id)`` key."""
+    stmt = select(models.Board)
+    if difficulty is not None:
+        stmt = stmt.where(models.Board.difficulty == difficulty)
+    if after is not None:
+        stmt = stmt.where(tuple_(models.Board.created_at, models.Board.id) < after)
+    result = await db.scalars(
+        stmt.order_by(models.Board.created_at.desc(), models.Board.id.desc()).limit(
+            limit
+        )
+    )
+    return list(result.all())
+
 
+async def iter_boards(
+    db: AsyncSession,
+    difficulty: models.Difficulty | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[models.Board]:
+    """Stream every board newest-first through a server-side cursor."""
+    stmt = select(models.Board).order_by(
+        models.Board.created_at.desc(), models.Board.id.desc()
+    )
+    if difficulty is not None:
+        stmt = stmt.where(models.Board.difficulty == difficulty)
+    # yield_per implies stream_results, so rows arrive in batches instead of
+    # being buffered client-side.
+    result = await db.stream_scalars(stmt.execution_options(yield_per=batch_size))
+    async for board in result:
+        yield board
+        # Nothing is re-read; drop rows from the identity map as we go.
+        db.expunge(board)
 
-def get_board_by_id(db: Session, board_id):
+
+async def get_board_by_id(db: AsyncSession, board_id):
     if not is_valid_uuid(board_id):
         raise HTTPException(400, f"Invalid Board id: {board_id}")
-    return db.get(models.Board, board_id)
+    return await db.get(models.Board, uuid.UUID(str(board_id)))
 
 
-def get_board_by_public_id(db: Session, public_id: str):
-    return db.execute(
+async def get_board_by_public_id(db: AsyncSession, public_id: str):
+    return await db.scalar(
         select(models.Board).where(models.Board.public_id == public_id)
-    ).scalar_one_or_none()
+    )
 
 
 def random_public_id() -> str:
@@ -1,5 +1,6 @@
 # api/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .settings import settings
@@ -7,14 +8,57 @@ from .settings import settings
 DATABASE_URL = settings.db_url
 print(f"[DB] Using URL: {repr(DATABASE_URL)}")  # dev log
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+# Sync engine: Alembic, scripts and anything not yet ported to async
 engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
 
+def async_url(url: str) -> str:
+    """Same database through its async driver: asyncpg / aiosqlite."""
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+ASYNC_DATABASE_URL = async_url(DATABASE_URL)
+# Created on first use, so importing this module (tests, Alembic, CLIs) does
+# not need the async driver.
+_async_engine: AsyncEngine | None = None
+# expire_on_commit=False: returned rows stay readable after the session commits
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,10 +1,54 @@
 # api/app/main.py
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .compute import compute
+from .corpus import corpus
+from .database import dispose_async_engine
+from .puzzle_pool import puzzle_pool
 from .routers import boards, games
+from .settings import settings
+
+
+def _create_tables():
+    from .database import engine  # sync engine; DDL runs once at startup
+    from .models import Base  # Base.metadata includes Board, User, RefreshToken, etc.
+
+    Base.metadata.create_all(bind=engine)
+
 
-app = FastAPI(title="Sudoku API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _create_tables()
+    compute.start(settings.compute_workers)
+    if settings.boards_random_backend == "corpus":
+        corpus.open(settings.corpus_path)
+    producer = None
+    if settings.puzzle_pool_enabled:
+        puzzle_pool.open()
+        producer = asyncio.create_task(
+            puzzle_pool.run_producer(
+                settings.puzzle_pool_low_water,
+                settings.puzzle_pool_target,
+                settings.puzzle_pool_interval,
+            )
+        )
+    try:
+        yield
+    finally:
+        if producer is not None:
+            producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer
+        compute.shutdown()
+        corpus.close()
+        await dispose_async_engine()
+
+
+app = FastAPI(title="Sudoku API", lifespan=lifespan)
 
 
 origins = [
@@ -29,13 +73,5 @@ def health():
     return {"status": "ok"}
 
 
-@app.on_event("startup")
-def _create_tables():
-    from .database import engine
-    from .models import Base  # Base.metadata includes Board, User, RefreshToken, etc.
-
-    Base.metadata.create_all(bind=engine)
-
-
 app.include_router(boards.router)
 app.include_router(games.router)
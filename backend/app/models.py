@@ -1,15 +1,17 @@
+import random
 import uuid
 from datetime import datetime as py_datetime
-from datetime import timedelta
+from datetime import timedelta, timezone
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, DateTime
+from sqlalchemy import BigInteger, Boolean, Column, DateTime
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy import ForeignKey, Index, String, Text, func
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, validates
 
 from .database import Base
+from .sudoku.grid import Grid
 
 
 class Difficulty(str, Enum):
@@ -173,9 +175,32 @@ class Board(Base):
     # Store Sudoku as flat 81-character strings
     initial_board = Column(String(81), nullable=False)
     solution_board = Column(String(81), nullable=False)
+    # codec.puzzle_hash(initial_board); lookups also compare initial_board
+    puzzle_hash = Column(BigInteger, nullable=True, index=True)
+    # codec.puzzle_hash of the canonical form (sudoku/canonical.py); equivalent
+    # puzzles share it. Later equivalents link to the first one stored.
+    canonical_hash = Column(BigInteger, nullable=True, index=True)
+    duplicate_of_id = Column(
+        PG_UUID(as_uuid=True), ForeignKey("boards.id"), nullable=True
+    )
+
+    # Grading, computed once on insert (see sudoku/grader.py)
+    rating = Column(Integer, nullable=True, index=True)  # grader.Technique value
+    technique = Column(String(32), nullable=True)
+    steps = Column(Integer, nullable=True)
+    clue_count = Column(Integer, nullable=True, index=True)
+    search_nodes = Column(Integer, nullable=True, index=True)
+
+    # Uniform key in [0, 1) for indexed random picks (see crud.get_random_board)
+    random_key = Column(Float, nullable=False, default=random.random)
 
+    # Python-side default as well: full-precision timestamps stored in one
+    # format keep the (created_at, id) keyset cursor exact on every backend.
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        server_default=func.now(),
+        default=lambda: py_datetime.now(timezone.utc),
+        nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
@@ -189,21 +214,32 @@ class Board(Base):
     def _validate_board_string(self, key, value):
         if len(value) != 81:
             raise ValueError(f"{key} must be exactly 81 characters long")
-        if not all(ch.isdigit() for ch in value):
+        if not (value.isascii() and value.isdigit()):
             raise ValueError(f"{key} must contain only digits (0–9)")
         if key == "solution_board" and "0" in value:
             raise ValueError("solution_board cannot contain zeros")
         return value
 
+    __table_args__ = (
+        Index("ix_boards_difficulty_random_key", "difficulty", "random_key"),
+        # Newest-first listings, per difficulty and overall; id breaks ties
+        # for the (created_at, id) keyset cursor.
+        Index(
+            "ix_boards_difficulty_created_at",
+            "difficulty",
+            created_at.desc(),
+            id.desc(),
+        ),
+        Index("ix_boards_created_at_id", created_at.desc(), id.desc()),
+    )
+
     def __repr__(self):
         return f"<Board {self.public_id} ({self.difficulty.name})>"
 
     # ---------------- Helpers ---------------- #
-    def to_grid(self):
-        """Return board as a 9×9 list of integers."""
-        return [
-            [int(self.initial_board[r * 9 + c]) for c in range(9)] for r in range(9)
-        ]
+    def to_grid(self) -> Grid:
+        """Return the initial board as a Grid."""
+        return Grid.from_str(self.initial_board)
 
     def check_consistency(self):
         """Ensure all given numbers in initial_board match solution_board."""
@@ -0,0 +1,107 @@
+# api/app/puzzle_pool.py
+import asyncio
+import fcntl
+import logging
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterable, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .compute import compute
+from .models import Difficulty
+from .settings import settings
+from .sudoku.generator import generate_puzzle
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    difficulty TEXT NOT NULL,
+    puzzle TEXT NOT NULL,
+    solution TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_puzzles_difficulty_id ON puzzles (difficulty, id);
+"""
+
+
+class PuzzlePool:
+    """Reservoir of pre-generated puzzles per difficulty in a local SQLite file.
+
+    Every uvicorn worker on the host opens the same file, so they all draw
+    from (and refill) one pool. ``pop`` is a single indexed DELETE ...
+    RETURNING, which SQLite runs atomically across processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        return closing(sqlite3.connect(self.path, timeout=5.0, isolation_level=None))
+
+    def open(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def pop(self, difficulty: Difficulty) -> Tuple[str, str] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "DELETE FROM puzzles WHERE id = ("
+                " SELECT id FROM puzzles WHERE difficulty = ? ORDER BY id LIMIT 1"
+                ") RETURNING puzzle, solution",
+                (difficulty.value,),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def push_many(self, difficulty: Difficulty, items: Iterable[Tuple[str, str]]):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO puzzles (difficulty, puzzle, solution) VALUES (?, ?, ?)",
+                [(difficulty.value, puzzle, solution) for puzzle, solution in items],
+            )
+            conn.execute("COMMIT")
+
+    def counts(self) -> Dict[Difficulty, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT difficulty, COUNT(*) FROM puzzles GROUP BY difficulty"
+            ).fetchall()
+        found = dict(rows)
+        return {d: found.get(d.value, 0) for d in Difficulty}
+
+    # ---------------- Producer ---------------- #
+    async def refill(self, low_water: int, target: int) -> int:
+        """Top up every difficulty below ``low_water`` to ``target`` puzzles."""
+        added = 0
+        counts = await run_in_threadpool(self.counts)
+        for difficulty, count in counts.items():
+            if count >= low_water:
+                continue
+            for _ in range(target - count):
+                item = await compute.run(generate_puzzle, None, difficulty)
+                await run_in_threadpool(self.push_many, difficulty, [item])
+                added += 1
+        return added
+
+    async def run_producer(self, low_water: int, target: int, interval: float):
+        # Only one process per host refills at a time; the others just consume.
+        with open(self.path + ".lock", "w") as lock:
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    await asyncio.sleep(interval)
+                    continue
+                try:
+                    await self.refill(low_water, target)
+                except Exception:  # keep the producer alive; retry next tick
+                    logger.exception("puzzle pool refill failed")
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                await asyncio.sleep(interval)
+
+
+puzzle_pool = PuzzlePool(settings.puzzle_pool_path)
@@ -1,62 +1,212 @@
 # api/app/routers/boards.py
-from typing import Annotated, TypeAlias
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Annotated, Literal, Optional, TypeAlias, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .. import schemas
+from .. import models, schemas
+from ..corpus import corpus
 from ..crud import boards as crud
-from ..database import get_db
+from ..database import get_async_db
+from ..settings import settings
+from ..sudoku.codec import pack_board, pack_solution
 
 router = APIRouter(prefix="/boards", tags=["boards"])
 
 DifficultyParam: str = Query("easy")
-DBSession: TypeAlias = Annotated[Session, Depends(get_db)]
+DBSession: TypeAlias = Annotated[AsyncSession, Depends(get_async_db)]
+
+MAX_PAGE_SIZE = 500
+
+BoardFormat: TypeAlias = Literal["full", "compact"]
+BoardOut = Union[schemas.BoardRead, schemas.BoardCompactRead]
+CorpusBoardOut = Union[schemas.CorpusBoardRead, schemas.CorpusBoardCompactRead]
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def _render(board, fmt: BoardFormat):
+    if fmt != "compact":
+        return schemas.BoardRead.model_validate(board)
+    # Packed per response: the table keeps only the strings, so the compact
+    # format shrinks payloads, not rows.
+    return schemas.BoardCompactRead(
+        id=board.id,
+        public_id=board.public_id,
+        difficulty=board.difficulty,
+        initial_packed=_b64(pack_board(board.initial_board)),
+        solution_packed=_b64(pack_solution(board.solution_board)),
+        rating=board.rating,
+    )
+
+
+def _render_corpus(index: int, fmt: BoardFormat):
+    if fmt != "compact":
+        return schemas.CorpusBoardRead(**corpus.record(index)._asdict())
+    # Compact reads never unpack: the mapped bytes go straight to base64.
+    record_id, difficulty, rating = corpus.header(index)
+    initial, solution = corpus.packed(index)
+    return schemas.CorpusBoardCompactRead(
+        index=index,
+        id=record_id,
+        difficulty=difficulty,
+        initial_packed=_b64(initial),
+        solution_packed=_b64(solution),
+        rating=rating,
+    )
+
+
+def _encode_cursor(board) -> str:
+    raw = f"{board.created_at.isoformat()}|{board.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, board_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(board_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(400, "Invalid cursor") from exc
 
 
 @router.post("", response_model=schemas.BoardRead)
-def create_board(req: schemas.BoardCreate, db: DBSession):
+async def create_board(req: schemas.BoardCreate, db: DBSession):
     # Pydantic already enforced lengths & consistency
-    board = crud.create_board(db, req)
+    board = await crud.create_board(db, req)
     return board
 
 
+def _validate_rows(rows: list[dict]):
+    """Split raw bulk rows into valid (index, BoardCreate) pairs and results."""
+    valid, rejected = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schemas.BoardCreate.model_validate(row)))
+        except ValidationError as exc:
+            error = "; ".join(e["msg"] for e in exc.errors())
+            rejected.append(schemas.BoardBulkResult(index=index, error=error))
+    return valid, rejected
+
+
+@router.post("/bulk", response_model=schemas.BoardBulkResp)
+async def create_boards(req: schemas.BoardBulkCreate, db: DBSession):
+    """Insert many boards in one transaction; each row is accepted or rejected."""
+    valid, results = _validate_rows(req.boards)
+    if valid:
+        inserted = await crud.create_boards(db, valid)
+        results += [
+            schemas.BoardBulkResult(index=index, id=board_id, error=error)
+            for index, (board_id, error) in inserted.items()
+        ]
+    results.sort(key=lambda r: r.index)
+    accepted = sum(1 for r in results if r.id is not None)
+    return schemas.BoardBulkResp(
+        inserted=accepted, rejected=len(results) - accepted, results=results
+    )
+
+
 @router.get("", response_model=list[schemas.BoardRead])
-def get_boards(db: DBSession):
-    boards = crud.get_board_all(db)
+async def get_boards(db: DBSession):
+    boards = await crud.get_board_all(db)
     if not boards:
         raise HTTPException(404, "Board not found")
     return boards
 
 
-@router.get("/random", response_model=schemas.BoardRead)
-def random_board(
+@router.get("/page", response_model=schemas.BoardPage)
+async def get_board_page(
+    db: DBSession,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    difficulty: Optional[models.Difficulty] = None,
+):
+    """Keyset-paginated listing, newest first, ordered by (created_at, id)."""
+    after = _decode_cursor(cursor) if cursor else None
+    boards = await crud.get_board_page(db, limit, after, difficulty)
+    next_cursor = _encode_cursor(boards[-1]) if len(boards) == limit else None
+    return schemas.BoardPage(items=boards, next_cursor=next_cursor)
+
+
+@router.get("/stream")
+async def stream_boards(db: DBSession, difficulty: Optional[models.Difficulty] = None):
+    """All boards as NDJSON, serialized row by row from a server-side cursor."""
+
+    async def lines():
+        try:
+            async for board in crud.iter_boards(db, difficulty):
+                yield schemas.BoardRead.model_validate(board).model_dump_json() + "\n"
+        finally:
+            await db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/random", response_model=Union[BoardOut, CorpusBoardOut])
+async def random_board(
     db: DBSession,
     difficulty=DifficultyParam,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    format: BoardFormat = "full",
 ):
-    return crud.get_random_board(db, difficulty)
+    """Random board; ``min_rating``/``max_rating`` filter by grader technique level.
+
+    With ``BOARDS_RANDOM_BACKEND=corpus`` it is read from the mapped corpus.
+    """
+    if settings.boards_random_backend == "corpus":
+        try:
+            difficulty = models.Difficulty(difficulty)
+        except ValueError:
+            raise HTTPException(404, f"No boards for {difficulty}")
+        index = corpus.random_index(difficulty, min_rating, max_rating)
+        if index is None:
+            raise HTTPException(404, f"No boards for {difficulty}")
+        return _render_corpus(index, format)
+    board = await crud.get_random_board(db, difficulty, min_rating, max_rating)
+    return _render(board, format)
+
+
+@router.get("/corpus/{index}", response_model=CorpusBoardOut)
+async def corpus_board(index: int, format: BoardFormat = "full"):
+    """Board by record number in the mapped corpus."""
+    if not corpus.loaded:
+        raise HTTPException(404, "Board corpus is not loaded")
+    if not 0 <= index < corpus.size:
+        raise HTTPException(404, "Board not found")
+    return _render_corpus(index, format)
 
 
 @router.get("/difficulty/{difficulty}", response_model=list[schemas.BoardRead])
-def get_board_by_level(db: DBSession, difficulty: str):
+async def get_board_by_level(db: DBSession, difficulty: str):
     """Get board with a difficulty (e.g. easy,  medium, hard, expert)"""
-    boards = crud.get_board_all_by_level(db, difficulty)
+    boards = await crud.get_board_all_by_level(db, difficulty)
     if not boards:
         raise HTTPException(404, "Board not found")
     return boards
 
 
-@router.get("/{board_id}", response_model=schemas.BoardRead)
-def get_board(board_id: str, db: DBSession):
-    board = crud.get_board_by_id(db, board_id)
+@router.get("/{board_id}", response_model=BoardOut)
+async def get_board(board_id: str, db: DBSession, format: BoardFormat = "full"):
+    board = await crud.get_board_by_id(db, board_id)
     if not board:
         raise HTTPException(404, "Board not found")
-    return board
+    return _render(board, format)
 
 
-@router.get("/by-public/{public_id}", response_model=schemas.BoardRead)
-def get_board_by_public_id(public_id: str, db: DBSession):
-    board = crud.get_board_by_public_id(db, public_id)
+@router.get("/by-public/{public_id}", response_model=BoardOut)
+async def get_board_by_public_id(
+    public_id: str, db: DBSession, format: BoardFormat = "full"
+):
+    board = await crud.get_board_by_public_id(db, public_id)
     if not board:
         raise HTTPException(404, "Board not found")
-    return board
+    return _render(board, format)
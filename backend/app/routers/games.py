@@ -1,96 +1,272 @@
 # api/app/routers/games.py
-from typing import Dict, List, Set, Tuple
+import asyncio
+import json
+from typing import Annotated, TypeAlias
 
-from fastapi import APIRouter, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from .. import schemas
-from ..sudoku.generator import from_str, generate_puzzle, solve_backtrack, to_str
+from ..compute import compute
+from ..crud import boards as crud
+from ..database import get_async_db
+from ..models import Difficulty
+from ..puzzle_pool import puzzle_pool
+from ..settings import settings
+from ..solve_cache import normalize_puzzle, solve_cache
+from ..sudoku.batch import solve_batch, validate_batch
+from ..sudoku.generator import generate_within, solve_str
+from ..sudoku.grid import Grid
+from ..sudoku.moves import MoveTracker, decode_token, encode_token
+from ..sudoku.solver import BudgetExceeded
 
 router = APIRouter(prefix="/games", tags=["games"])
 
-Board = List[List[int]]
-
-
-def _row_conflicts(board: Board) -> Set[int]:
-    bad: Set[int] = set()
-
-    for row in range(9):
-        seen_row: Dict[int, int] = {}  # value -> co
-        for col in range(9):
-            value = board[row][col]
-            if value == 0:
-                continue
-            if value in seen_row:
-                bad |= {row * 9 + col, row * 9 + seen_row[value]}
-            else:
-                seen_row[value] = col
-    return bad
-
-
-def _col_conflicts(board: Board) -> Set[int]:
-    bad: Set[int] = set()
-
-    for col in range(9):
-        seen_col: Dict[int, int] = {}  # value -> row
-        for row in range(9):
-            value = board[row][col]
-            if value == 0:
-                continue
-            if value in seen_col:
-                bad |= {row * 9 + col, seen_col[value] * 9 + col}
-            else:
-                seen_col[value] = row
-
-    return bad
-
-
-def _box_conflicts(board: Board) -> Set[int]:
-    bad: Set[int] = set()
-    for board_row in range(0, 9, 3):
-        for board_col in range(0, 9, 3):
-            seen_box: Dict[int, Tuple[int, int]] = {}  # value -> (row, col)
-            for i in range(3):
-                for j in range(3):
-                    row, col = board_row + i, board_col + j
-                    value = board[row][col]
-                    if value == 0:
-                        continue
-                    if value in seen_box:
-                        rr, cc = seen_box[value]  # type ignore
-                        bad |= {row * 9 + col, rr * 9 + cc}
-                    else:
-                        seen_box[value] = (row, col)
-    return bad
-
-
-def _conflicts(state: str) -> tuple[list[int], bool]:
-    board = from_str(state)
-    bad = _row_conflicts(board) | _col_conflicts(board) | _box_conflicts(board)
-    full = all(board[r][c] != 0 for r in range(9) for c in range(9))
-    return sorted(bad), full
+DBSession: TypeAlias = Annotated[AsyncSession, Depends(get_async_db)]
 
 
 @router.post("/validate", response_model=schemas.ValidateResp)
 def validate(req: schemas.ValidateReq):
     state = req.board.state or req.board.puzzle
-    bad, full = _conflicts(state)
+    try:
+        board = Grid.from_str(state)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    bad = board.conflicts()
     return schemas.ValidateResp(
-        valid=len(bad) == 0, complete=(len(bad) == 0 and full), conflicts=bad
+        valid=len(bad) == 0,
+        complete=(len(bad) == 0 and board.is_full()),
+        conflicts=bad,
+        token=encode_token(board),
     )
 
 
+@router.post("/validate/move", response_model=schemas.MoveValidateResp)
+def validate_move(req: schemas.MoveValidateReq):
+    """Apply one edit to a /validate token and return only the conflict changes."""
+    try:
+        tracker = MoveTracker(decode_token(req.token))
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    added, removed = tracker.apply(req.index, req.value)
+    return schemas.MoveValidateResp(
+        token=encode_token(tracker.grid),
+        added=added,
+        removed=removed,
+        full=tracker.grid.is_full(),
+    )
+
+
+@router.post("/validate/batch", response_model=schemas.BatchValidateResp)
+async def validate_many(req: schemas.BatchValidateReq):
+    states = [board.state or board.puzzle for board in req.boards]
+    try:
+        checked = await compute.run(validate_batch, states)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    return schemas.BatchValidateResp(
+        results=[
+            schemas.BoardValidation(
+                valid=not bad, complete=full and not bad, conflicts=bad
+            )
+            for bad, full in checked
+        ]
+    )
+
+
+async def _solve_or_map(db: AsyncSession, puzzle: str) -> str | None:
+    """Quick bounded solve; if that runs out, reuse a stored equivalent board's
+    solution (canonicalizing costs about as much as the quick budget) before
+    paying for the full search."""
+    try:
+        return await compute.run(solve_str, puzzle, settings.solve_quick_nodes)
+    except BudgetExceeded:
+        pass
+    solution = await crud.get_equivalent_solution(db, puzzle)
+    if solution is None:
+        solution = await compute.run(solve_str, puzzle)
+    return solution
+
+
 @router.post("/solve", response_model=schemas.SolveResp)
-def solve(req: schemas.SolveReq):
-    state = req.board.state or req.board.puzzle
-    b = from_str(state)
-    if not solve_backtrack(b):
+async def solve(req: schemas.SolveReq, db: DBSession):
+    key = normalize_puzzle(req.board.state or req.board.puzzle)
+    try:
+        # Checked first: the cache and the stored-solution hash assume a board.
+        Grid.from_str(key)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    hit, solution = solve_cache.lookup(key)
+    if not hit:
+        # Published boards already carry their solution; only solve the rest.
+        solution = await crud.get_stored_solution(db, key)
+        if solution is None:
+            try:
+                solution = await _solve_or_map(db, key)
+            except ValueError as exc:
+                raise HTTPException(400, str(exc)) from exc
+        solve_cache.store(key, solution)
+    if solution is None:
         raise HTTPException(400, "Unsolvable")
-    return schemas.SolveResp(solution=to_str(b))
+    return schemas.SolveResp(solution=solution)
+
+
+@router.get("/solve/cache")
+def solve_cache_stats():
+    return solve_cache.stats()
+
+
+@router.post("/solve/batch", response_model=schemas.BatchSolveResp)
+async def solve_many(req: schemas.BatchSolveReq):
+    states = [board.state or board.puzzle for board in req.boards]
+    try:
+        solutions = await compute.run(solve_batch, states)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from exc
+    return schemas.BatchSolveResp(solutions=solutions)
+
+
+def _parse_move(message: dict) -> tuple[int, int]:
+    """A move is a 2-byte binary frame ``[index, value]`` or text ``"index,value"``."""
+    if message.get("bytes") is not None:
+        if len(message["bytes"]) != 2:
+            raise ValueError("binary moves are exactly 2 bytes")
+        index, value = message["bytes"]
+    else:
+        index, value = map(int, (message.get("text") or "").split(","))
+    if not (0 <= index <= 80 and 0 <= value <= 9):
+        raise ValueError("index must be 0-80 and value 0-9")
+    return index, value
+
+
+def _delta(added: list[int], removed: list[int], full: bool, conflicts: set) -> str:
+    return json.dumps(
+        {
+            "added": added,
+            "removed": removed,
+            "full": full,
+            "complete": full and not conflicts,
+        },
+        separators=(",", ":"),
+    )
+
+
+async def _play(websocket: WebSocket, tracker: MoveTracker) -> None:
+    conflicts = set(tracker.grid.conflicts())
+    full = tracker.grid.is_full()
+    await websocket.send_text(_delta(sorted(conflicts), [], full, conflicts))
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("text") is None and message.get("bytes") is None:
+            raise ValueError("moves must be text or binary frames")
+        try:
+            index, value = _parse_move(message)
+        except ValueError as exc:
+            await websocket.send_text(json.dumps({"error": str(exc)}))
+            continue
+        added, removed = tracker.apply(index, value)
+        conflicts.update(added)
+        conflicts.difference_update(removed)
+        full = tracker.grid.is_full()
+        await websocket.send_text(_delta(added, removed, full, conflicts))
+
+
+async def _receive_board(websocket: WebSocket) -> Grid:
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+    if message.get("text") is None:
+        raise ValueError("the first frame must be the board as text")
+    return Grid.from_str(message["text"])
+
+
+@router.websocket("/ws")
+async def game_channel(websocket: WebSocket):
+    """Validate moves over one connection that keeps the board in memory.
+
+    The first text frame is the 81-character board; every later frame is a
+    move. Each message gets back conflict deltas as compact JSON
+    (``added``/``removed``/``full``/``complete``), starting from an empty
+    conflict set for the first board.
+    """
+    await websocket.accept()
+    try:
+        tracker = MoveTracker(await _receive_board(websocket))
+        await _play(websocket, tracker)
+    except ValueError as exc:
+        await websocket.close(status.WS_1008_POLICY_VIOLATION, reason=str(exc))
+    except WebSocketDisconnect:
+        pass
+
+
+async def _stored_board(db: AsyncSession, difficulty: Difficulty):
+    try:
+        return await crud.get_random_board(db, difficulty)
+    except HTTPException:
+        return None
 
 
 @router.post("/new", response_model=schemas.NewGameResp)
-def new(req: schemas.NewGameReq):
-    puzzle, solution = generate_puzzle(req.seed, req.difficulty or "easy")
-    return schemas.NewGameResp(
-        difficulty=(req.difficulty or "easy"), puzzle=puzzle, solution=solution
+async def new(req: schemas.NewGameReq, db: DBSession):
+    difficulty = req.difficulty or Difficulty.EASY
+    pooled = None
+    # Seeded requests must be reproducible, so only unseeded ones use the pool.
+    if req.seed is None and settings.puzzle_pool_enabled:
+        pooled = await run_in_threadpool(puzzle_pool.pop, difficulty)
+    if pooled is not None:
+        puzzle, solution = pooled
+        return schemas.NewGameResp(
+            difficulty=difficulty,
+            puzzle=puzzle,
+            solution=solution,
+            clues=81 - puzzle.count("0"),
+        )
+
+    # Degrade in order: best puzzle within budget, a stored board, then 503.
+    result = None
+    try:
+        result = await asyncio.wait_for(
+            compute.run(
+                generate_within,
+                req.seed,
+                difficulty,
+                settings.generation_timeout,
+                settings.generation_max_nodes,
+            ),
+            # Generation stops itself at the deadline; this only guards a
+            # saturated compute pool that has not started the job yet.
+            timeout=settings.generation_timeout * 2,
+        )
+    except asyncio.TimeoutError:
+        pass
+    if result is not None and result.clues < 81:
+        return schemas.NewGameResp(
+            difficulty=difficulty,
+            puzzle=result.puzzle,
+            solution=result.solution,
+            clues=result.clues,
+        )
+
+    board = await _stored_board(db, difficulty)
+    if board is not None:
+        return schemas.NewGameResp(
+            difficulty=difficulty,
+            puzzle=board.initial_board,
+            solution=board.solution_board,
+            clues=81 - board.initial_board.count("0"),
+        )
+    raise HTTPException(
+        503,
+        "Puzzle generation is busy; try again shortly",
+        headers={"Retry-After": str(settings.generation_retry_after)},
     )
@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 # Import the Difficulty enum from your models module to avoid duplication.
 # Adjust the import path to match your project layout.
 from .models import Difficulty
+from .sudoku.batch import check_puzzle
 
 # =========================
 # Shared / Utilities
@@ -19,7 +20,7 @@ from .models import Difficulty
 def _validate_board_str(value: str, *, field_name: str) -> str:
     if len(value) != 81:
         raise ValueError(f"{field_name} must be exactly 81 characters long")
-    if not value.isdigit():
+    if not (value.isascii() and value.isdigit()):
         raise ValueError(f"{field_name} must contain only digits (0–9)")
     if field_name == "solution_board" and "0" in value:
         raise ValueError("solution_board cannot contain zeros")
@@ -69,20 +70,14 @@ class BoardBase(BaseModel):
 
 
 class BoardCreate(BoardBase):
-    # Optional strict check: enforce the clue count equals the Difficulty value.
-    # Comment this out if you prefer not to enforce it.
-    @field_validator("initial_board")
+    # Clue count is no longer tied to difficulty: boards are graded on insert
+    # (rating/technique columns), which tracks real hardness far better.
+    @field_validator("difficulty", mode="before")
     @classmethod
-    def _v_clues_match_difficulty(cls, v: str, info):
-        difficulty: Difficulty | None = info.data.get("difficulty")
-        if difficulty is not None:
-            clues = _count_clues(v)
-            expected = int(difficulty.value)
-            if clues != expected:
-                raise ValueError(
-                    f"initial_board has {clues} clues;"
-                    "expected {expected} for {difficulty.name.lower()}"
-                )
+    def _v_difficulty_name(cls, v):
+        # Accept enum names in any case ("MEDIUM") as well as values ("medium")
+        if isinstance(v, str) and not isinstance(v, Difficulty):
+            return v.strip().lower()
         return v
 
 
@@ -118,10 +113,74 @@ class BoardRead(BaseModel):
     difficulty: Difficulty
     initial_board: str
     solution_board: str
+    rating: Optional[int] = None
+    technique: Optional[str] = None
+    steps: Optional[int] = None
+    clue_count: Optional[int] = None
+    search_nodes: Optional[int] = None
+    # First stored board equivalent to this one under the sudoku symmetries
+    duplicate_of_id: Optional[uuid.UUID] = None
     created_at: datetime
     updated_at: datetime
 
 
+class BoardCompactRead(BaseModel):
+    """Opt-in compact board (``?format=compact``); boards are base64url-encoded
+    packed bytes, see sudoku/codec.py."""
+
+    id: uuid.UUID
+    public_id: str
+    difficulty: Difficulty
+    initial_packed: str
+    solution_packed: str
+    rating: Optional[int] = None
+
+
+class CorpusBoardRead(BaseModel):
+    """Board served from the memory-mapped corpus; ``id`` is the stored board
+    it was built from."""
+
+    index: int  # record number; GET /boards/corpus/{index}
+    id: uuid.UUID
+    difficulty: Difficulty
+    initial_board: str
+    solution_board: str
+    rating: Optional[int] = None
+
+
+class CorpusBoardCompactRead(BaseModel):
+    index: int
+    id: uuid.UUID
+    difficulty: Difficulty
+    initial_packed: str
+    solution_packed: str
+    rating: Optional[int] = None
+
+
+class BoardBulkCreate(BaseModel):
+    # Raw rows: each is validated as BoardCreate on its own, so one bad row is
+    # reported in the results instead of failing the whole request.
+    boards: list[dict[str, Any]] = Field(..., min_length=1, max_length=50000)
+
+
+class BoardBulkResult(BaseModel):
+    index: int  # position in the request
+    id: Optional[uuid.UUID] = None  # set when inserted
+    error: Optional[str] = None  # set when rejected
+
+
+class BoardBulkResp(BaseModel):
+    inserted: int
+    rejected: int
+    results: list[BoardBulkResult]
+
+
+class BoardPage(BaseModel):
+    items: list[BoardRead]
+    # Opaque; pass back as ?cursor= to fetch the next page. None on the last page.
+    next_cursor: Optional[str] = None
+
+
 class BoardPayload(BaseModel):
     puzzle: str
     state: Optional[str] = None
@@ -131,12 +190,31 @@ class ValidateReq(BaseModel):
     board: BoardPayload
 
 
-class ValidateResp(BaseModel):
+class BoardValidation(BaseModel):
     valid: bool
     complete: bool
     conflicts: list[int]
 
 
+class ValidateResp(BoardValidation):
+    # Pass to /games/validate/move to check later edits one cell at a time
+    token: str
+
+
+class MoveValidateReq(BaseModel):
+    token: str
+    index: int = Field(..., ge=0, le=80)
+    value: int = Field(..., ge=0, le=9)  # 0 clears the cell
+
+
+class MoveValidateResp(BaseModel):
+    token: str
+    # Changes to the conflict set from ValidateResp.conflicts, not the whole set
+    added: list[int]
+    removed: list[int]
+    full: bool  # no blanks left; complete if the client's conflict set is empty
+
+
 class NewGameReq(BaseModel):
     # accept many forms: "easy", "EASY", "MEDIUM", 30 (clues), or Difficulty.MEDIUM
     difficulty: Difficulty = Difficulty.EASY
@@ -181,6 +259,8 @@ class NewGameResp(BaseModel):
     difficulty: Difficulty
     puzzle: str
     solution: str
+    # Clues actually in the puzzle; may exceed the difficulty's target
+    clues: int
 
 
 class SolveReq(BaseModel):
@@ -191,6 +271,38 @@ class SolveResp(BaseModel):
     solution: str
 
 
+def _check_batch_boards(boards: list[BoardPayload]) -> list[BoardPayload]:
+    # Batch endpoints pack rows side by side; a short row would shift the rest.
+    for i, board in enumerate(boards):
+        for name in ("puzzle", "state"):
+            value = getattr(board, name)
+            error = check_puzzle(value) if value is not None else None
+            if error is not None:
+                raise ValueError(f"boards[{i}].{name} {error}")
+    return boards
+
+
+class BatchSolveReq(BaseModel):
+    boards: list[BoardPayload] = Field(..., min_length=1, max_length=10000)
+
+    _v_boards = field_validator("boards")(_check_batch_boards)
+
+
+class BatchSolveResp(BaseModel):
+    # Same order as the request; None marks an unsolvable board
+    solutions: list[Optional[str]]
+
+
+class BatchValidateReq(BaseModel):
+    boards: list[BoardPayload] = Field(..., min_length=1, max_length=10000)
+
+    _v_boards = field_validator("boards")(_check_batch_boards)
+
+
+class BatchValidateResp(BaseModel):
+    results: list[BoardValidation]  # same order as the request
+
+
 # =========================
 # User Schemas
 # =========================
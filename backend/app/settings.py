@@ -1,10 +1,13 @@
 import os
+import tempfile
 from typing import Optional
 from urllib.parse import quote_plus
 
-from pydantic import computed_field
+from pydantic import computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+SOLVER_ENGINES = ("bitmask", "dlx")  # keys of sudoku.solver.ENGINES
+
 
 class Settings(BaseSettings):
     app_name: str = os.getenv("APP_NAME", "Sudokupy API")
@@ -22,6 +25,51 @@ class Settings(BaseSettings):
     db_password: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     test_database_url: str = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
 
+    solver_engine: str = os.getenv("SOLVER_ENGINE", "bitmask")  # bitmask|dlx
+    # Processes for puzzle generation/solving; 0 runs them on the threadpool
+    compute_workers: int = int(os.getenv("COMPUTE_WORKERS", str(os.cpu_count() or 1)))
+
+    # Budget for live /games/new generation before degrading (seconds / nodes)
+    generation_timeout: float = float(os.getenv("GENERATION_TIMEOUT", "2.0"))
+    generation_max_nodes: int = int(os.getenv("GENERATION_MAX_NODES", "20000"))
+    generation_retry_after: int = int(os.getenv("GENERATION_RETRY_AFTER", "5"))
+
+    # Pre-generated puzzle reservoir shared by all workers on the host
+    puzzle_pool_enabled: bool = bool(
+        os.getenv("PUZZLE_POOL_ENABLED", "true").lower() in ("1", "true", "yes")
+    )
+    puzzle_pool_path: str = os.getenv(
+        "PUZZLE_POOL_PATH",
+        os.path.join(tempfile.gettempdir(), "sudokupy_puzzle_pool.sqlite3"),
+    )
+    puzzle_pool_low_water: int = int(os.getenv("PUZZLE_POOL_LOW_WATER", "20"))
+    puzzle_pool_target: int = int(os.getenv("PUZZLE_POOL_TARGET", "50"))
+    puzzle_pool_interval: float = float(os.getenv("PUZZLE_POOL_INTERVAL", "5"))
+
+    # In-process /games/solve result cache; size 0 disables it
+    solve_cache_size: int = int(os.getenv("SOLVE_CACHE_SIZE", "10000"))
+    solve_cache_ttl: float = float(os.getenv("SOLVE_CACHE_TTL", "3600"))  # seconds
+    # Search nodes /games/solve spends before looking for a stored equivalent
+    solve_quick_nodes: int = int(os.getenv("SOLVE_QUICK_NODES", "100"))
+
+    # Creating a board equivalent to a stored one: link|reject (409)
+    board_duplicates: str = os.getenv("BOARD_DUPLICATES", "link")
+
+    # Where /boards/random reads from: db|corpus (memory-mapped, built offline)
+    boards_random_backend: str = os.getenv("BOARDS_RANDOM_BACKEND", "db")
+    corpus_path: str = os.getenv("CORPUS_PATH", "./boards.corpus")
+
+    @model_validator(mode="after")
+    def _check_solver_engine(self) -> "Settings":
+        # A bad engine is a deployment error: fail at startup, not per request.
+        self.solver_engine = self.solver_engine.strip().lower()
+        if self.solver_engine not in SOLVER_ENGINES:
+            raise ValueError(
+                f"SOLVER_ENGINE must be one of {', '.join(SOLVER_ENGINES)}, "
+                f"got {self.solver_engine!r}"
+            )
+        return self
+
     @computed_field(return_type=str)
     def db_url(self) -> str:
         # tests override
@@ -0,0 +1,77 @@
+# api/app/solve_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from .settings import settings
+
+
+def normalize_puzzle(state: str) -> str:
+    """Cache key for a board: surrounding whitespace dropped, '.' blanks as '0'."""
+    return state.strip().replace(".", "0")
+
+
+class SolveCache:
+    """Bounded LRU of solve results with a per-entry TTL.
+
+    Unsolvable boards are stored as ``None`` (negative entries): they are the
+    most expensive to prove, so they benefit the most. ``max_size == 0``
+    disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str | None]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def lookup(self, key: str) -> Tuple[bool, str | None]:
+        """Return ``(hit, solution)``; a hit with ``None`` means unsolvable."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def store(self, key: str, solution: str | None) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, solution)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+solve_cache = SolveCache(settings.solve_cache_size, settings.solve_cache_ttl)
@@ -0,0 +1,125 @@
+# api/app/sudoku/batch.py
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .grid import Grid
+from .solver import ALL_DIGITS, CELL_UNITS, UNITS, solve_cells
+
+# Puzzles are processed this many at a time to bound the (N, 27, 9, 9) arrays.
+CHUNK_SIZE = 4096
+
+UNIT_CELLS = np.array(UNITS, dtype=np.intp)  # (27, 9)
+CELL_UNIT_IDX = np.array(CELL_UNITS, dtype=np.intp)  # (81, 3)
+DIGIT_BIT = np.array([0] + [1 << v for v in range(1, 10)], dtype=np.uint16)
+DIGIT_SHIFTS = np.arange(1, 10, dtype=np.uint16)
+
+
+def check_puzzle(puzzle: str) -> str | None:
+    """Why ``puzzle`` is not an 81-digit board string, or None if it is."""
+    if len(puzzle) != 81:
+        return "must be exactly 81 characters long"
+    if not (puzzle.isascii() and puzzle.isdigit()):
+        return "must contain only digits (0–9)"
+    return None
+
+
+def to_array(puzzles: Sequence[str]) -> np.ndarray:
+    """Pack 81-character digit strings into an (N, 81) uint8 array."""
+    for i, puzzle in enumerate(puzzles):
+        error = check_puzzle(puzzle)
+        if error is not None:
+            raise ValueError(f"puzzle {i} {error}")
+    raw = "".join(puzzles).encode("ascii")
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(puzzles), 81) - ord("0")
+
+
+def _unit_masks(grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (N, 27) digit masks per unit and an (N,) duplicate-digit flag."""
+    unit_bits = DIGIT_BIT[grid][:, UNIT_CELLS]  # (N, 27, 9)
+    used = np.bitwise_or.reduce(unit_bits, axis=2)
+    # Bits are distinct powers of two, so sum == OR unless a digit repeats.
+    duplicated = np.any(unit_bits.sum(axis=2, dtype=np.uint16) != used, axis=1)
+    return used, duplicated
+
+
+def _eliminate(grid: np.ndarray) -> np.ndarray:
+    """Fill naked and hidden singles in place; return a mask of dead puzzles."""
+    dead = _unit_masks(grid)[1]
+    active = np.flatnonzero(~dead & np.any(grid == 0, axis=1))
+    while active.size:
+        sub = grid[active]
+        used, stuck = _unit_masks(sub)
+        peer_used = np.bitwise_or.reduce(used[:, CELL_UNIT_IDX], axis=2)  # (n, 81)
+        filled = sub > 0
+        cand = np.where(filled, 0, ALL_DIGITS & ~peer_used).astype(np.uint16)
+        stuck |= np.any(~filled & (cand == 0), axis=1)
+
+        digits = ((cand[:, :, None] >> DIGIT_SHIFTS) & 1).astype(np.uint8)
+        per_unit = digits[:, UNIT_CELLS, :]  # (n, 27, 9 cells, 9 digits)
+        counts = per_unit.sum(axis=2)
+        placed = ((used[:, :, None] >> DIGIT_SHIFTS) & 1).astype(bool)
+        stuck |= np.any((counts == 0) & ~placed, axis=(1, 2))
+        dead[active[stuck]] = True
+
+        live = ~stuck[:, None]
+        naked = live & (digits.sum(axis=2) == 1)
+        hidden = live[:, :, None] & (counts == 1)
+        n, cell = np.nonzero(naked)
+        sub[n, cell] = np.argmax(digits[n, cell], axis=1) + 1
+        n, unit, digit = np.nonzero(hidden)
+        pos = np.argmax(per_unit[n, unit, :, digit], axis=1)
+        sub[n, UNIT_CELLS[unit, pos]] = digit + 1
+        grid[active] = sub
+
+        # Keep iterating only puzzles that moved and still have blanks.
+        moved = naked.any(axis=1) | hidden.any(axis=(1, 2))
+        active = active[moved & np.any(sub == 0, axis=1)]
+    # Simultaneous placements can collide on the final pass.
+    return dead | _unit_masks(grid)[1]
+
+
+def _conflict_mask(grid: np.ndarray) -> np.ndarray:
+    """(N, 81) mask of filled cells whose digit repeats in one of their units."""
+    unit_digits = grid[:, UNIT_CELLS]  # (N, 27, 9)
+    counts = (unit_digits[..., None] == DIGIT_SHIFTS.astype(np.uint8)).sum(axis=2)
+    dup_bits = np.where(counts > 1, DIGIT_BIT[1:], 0).sum(axis=2, dtype=np.uint16)
+    cell_dups = np.bitwise_or.reduce(dup_bits[:, CELL_UNIT_IDX], axis=2)  # (N, 81)
+    return (grid > 0) & ((cell_dups & DIGIT_BIT[grid]) != 0)
+
+
+def validate_batch(states: Sequence[str]) -> List[Tuple[List[int], bool]]:
+    """Return ``(sorted conflicting cells, full)`` for every board state."""
+    results: List[Tuple[List[int], bool]] = []
+    for start in range(0, len(states), CHUNK_SIZE):
+        grid = to_array(states[start : start + CHUNK_SIZE])
+        bad = _conflict_mask(grid)
+        full = np.all(grid > 0, axis=1).tolist()
+        board, cell = np.nonzero(bad)  # row-major, so cells come out sorted
+        splits = np.cumsum(np.bincount(board, minlength=len(grid)))[:-1]
+        for cells, is_full in zip(np.split(cell, splits), full):
+            results.append((cells.tolist(), is_full))
+    return results
+
+
+def solve_batch(puzzles: Sequence[str]) -> List[str | None]:
+    """Solve many puzzles at once; unsolvable puzzles map to None.
+
+    Singles are eliminated across the whole batch with array operations; only
+    puzzles still incomplete afterwards go through the per-puzzle solver.
+    """
+    results: List[str | None] = []
+    for start in range(0, len(puzzles), CHUNK_SIZE):
+        grid = to_array(puzzles[start : start + CHUNK_SIZE])
+        dead = _eliminate(grid)
+        text = (grid + ord("0")).tobytes().decode("ascii")
+        for k, is_dead in enumerate(dead):
+            row = text[k * 81 : k * 81 + 81]
+            if is_dead:
+                results.append(None)
+            elif "0" not in row:
+                results.append(row)
+            else:
+                cells = solve_cells(grid[k].tolist())
+                results.append(None if cells is None else str(Grid(cells)))
+    return results
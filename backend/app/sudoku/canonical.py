@@ -0,0 +1,161 @@
+# api/app/sudoku/canonical.py
+from itertools import permutations, product
+from typing import List, NamedTuple, Sequence, Tuple
+
+from .codec import puzzle_hash
+from .transforms import Transform
+
+# Fewer clues than this never have a unique solution; such boards are not
+# canonicalized (an all-blank board would tie on every branch).
+MIN_CLUES = 17
+
+# Every column order the symmetry group allows: stack order, then the order
+# of the three columns inside each stack.
+_ORDERS = list(permutations(range(3)))
+COL_ORDERS: List[Tuple[int, ...]] = [
+    tuple(stack * 3 + within[k][c] for k, stack in enumerate(stacks) for c in range(3))
+    for stacks in _ORDERS
+    for within in product(_ORDERS, repeat=3)
+]
+
+
+class Canonical(NamedTuple):
+    board: str  # minimal representative of the puzzle's equivalence class
+    transform: Transform  # maps the input onto ``board``
+
+    @property
+    def hash(self) -> int:
+        return puzzle_hash(self.board)
+
+
+class _Partial(NamedTuple):
+    """One branch of the search: a fixed column order and the rows placed so far."""
+
+    grid: Tuple[Tuple[int, ...], ...]  # source rows, after the optional transpose
+    transpose: bool
+    cols: Tuple[int, ...]
+    rows: Tuple[int, ...]
+    labels: Tuple[int, ...]  # digit -> new label, 0 while unassigned
+    next_label: int
+
+
+def _relabel(values: Sequence[int], cols, labels, next_label):
+    """Row as it reads in column order ``cols``, labelling digits on first use."""
+    out = []
+    labels = list(labels)
+    for c in cols:
+        v = values[c]
+        if v and not labels[v]:
+            labels[v] = next_label
+            next_label += 1
+        out.append(labels[v])
+    return tuple(out), tuple(labels), next_label
+
+
+def _next_rows(rows: Tuple[int, ...]) -> List[int]:
+    """Source rows allowed at the next position: rest of the band, or a new band."""
+    if len(rows) % 3:
+        band = rows[-1] // 3
+        return [r for r in range(band * 3, band * 3 + 3) if r not in rows]
+    used = {r // 3 for r in rows}
+    return [r for r in range(9) if r // 3 not in used]
+
+
+def _blank_pattern(values: Sequence[int]) -> Tuple[int, ...]:
+    """Smallest filled/blank pattern any column order gives this row.
+
+    Blanks go first inside each stack and the emptiest stacks go first, so
+    rows whose pattern is larger can never start the minimal board.
+    """
+    filled = sorted(sum(1 for v in values[s * 3 : s * 3 + 3] if v) for s in range(3))
+    return tuple(k >= 3 - n for n in filled for k in range(3))
+
+
+def _first_row(cells: Sequence[int]) -> Tuple[Tuple[int, ...], List[_Partial]]:
+    grids = [
+        (
+            transpose,
+            tuple(
+                tuple(
+                    cells[c * 9 + r] if transpose else cells[r * 9 + c]
+                    for c in range(9)
+                )
+                for r in range(9)
+            ),
+        )
+        for transpose in (False, True)
+    ]
+    pattern = min(_blank_pattern(row) for _, grid in grids for row in grid)
+    best, ties = None, []
+    blank = (0,) * 10
+    for transpose, grid in grids:
+        for r in range(9):
+            if _blank_pattern(grid[r]) != pattern:
+                continue
+            for cols in COL_ORDERS:
+                row, labels, next_label = _relabel(grid[r], cols, blank, 1)
+                if best is None or row < best:
+                    best, ties = row, []
+                if row == best:
+                    ties.append(
+                        _Partial(grid, transpose, cols, (r,), labels, next_label)
+                    )
+    return best, ties
+
+
+def canonicalize(cells: Sequence[int]) -> Canonical:
+    """Minimal 81-cell string over transposition, band/stack and line orders
+    and digit relabelling (blanks read as 0, the smallest symbol).
+
+    Rows are fixed one at a time and only branches tied for the smallest
+    prefix survive, so the full group is never enumerated for real puzzles.
+    """
+    best, partials = _first_row(cells)
+    board = list(best)
+    for _ in range(8):
+        best, ties = None, []
+        for p in partials:
+            for r in _next_rows(p.rows):
+                row, labels, next_label = _relabel(
+                    p.grid[r], p.cols, p.labels, p.next_label
+                )
+                if best is None or row < best:
+                    best, ties = row, []
+                if row == best:
+                    ties.append(
+                        p._replace(
+                            rows=p.rows + (r,), labels=labels, next_label=next_label
+                        )
+                    )
+        board.extend(best)
+        # Branches that used the same rows under the same columns and labels
+        # continue identically; keep one of each.
+        seen = {}
+        for p in ties:
+            seen.setdefault((p.transpose, p.cols, frozenset(p.rows), p.labels), p)
+        partials = list(seen.values())
+    p = partials[0]
+    # Digits that never appear still need distinct labels for a valid Transform.
+    labels, next_label = list(p.labels), p.next_label
+    for v in range(1, 10):
+        if not labels[v]:
+            labels[v] = next_label
+            next_label += 1
+    transform = Transform(p.transpose, p.rows, p.cols, tuple(labels))
+    return Canonical("".join(map(str, board)), transform)
+
+
+def canonicalize_str(board: str) -> Canonical:
+    return canonicalize([int(ch) for ch in board])
+
+
+def canonical_form(board: str) -> Canonical | None:
+    """Canonicalize ``board``, or None below MIN_CLUES."""
+    if 81 - board.count("0") < MIN_CLUES:
+        return None
+    return canonicalize_str(board)
+
+
+def map_solution(solution: str, source: Canonical, target: Canonical) -> str:
+    """Carry the solution of ``source``'s puzzle onto equivalent ``target``'s."""
+    return target.transform.inverse().apply_str(source.transform.apply_str(solution))
@@ -0,0 +1,44 @@
+# api/app/sudoku/codec.py
+# Compact binary encodings for 81-character board strings. Puzzles pack two
+# cells per byte (4 bits each, 41 bytes); solved grids have no blanks, so they
+# are stored as one base-10 integer in 34 bytes.
+import hashlib
+
+PACKED_BOARD_SIZE = 41
+PACKED_SOLUTION_SIZE = 34  # 10**81 < 2**272
+
+
+def pack_board(board: str) -> bytes:
+    digits = [int(ch) for ch in board]
+    if len(digits) != 81:
+        raise ValueError("board must be exactly 81 characters long")
+    digits.append(0)  # pad the last nibble
+    return bytes((digits[k] << 4) | digits[k + 1] for k in range(0, 82, 2))
+
+
+def unpack_board(data: bytes) -> str:
+    if len(data) != PACKED_BOARD_SIZE:
+        raise ValueError(f"packed board must be {PACKED_BOARD_SIZE} bytes")
+    return "".join(f"{byte:02x}" for byte in data)[:81]
+
+
+def pack_solution(solution: str) -> bytes:
+    if (
+        len(solution) != 81
+        or not (solution.isascii() and solution.isdigit())
+        or "0" in solution
+    ):
+        raise ValueError("solution must be 81 digits 1-9")
+    return int(solution).to_bytes(PACKED_SOLUTION_SIZE, "big")
+
+
+def unpack_solution(data: bytes) -> str:
+    if len(data) != PACKED_SOLUTION_SIZE:
+        raise ValueError(f"packed solution must be {PACKED_SOLUTION_SIZE} bytes")
+    return str(int.from_bytes(data, "big")).zfill(81)
+
+
+def puzzle_hash(board: str) -> int:
+    """Signed 64-bit digest of a board string, for an indexed BigInteger column."""
+    digest = hashlib.blake2b(board.encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -0,0 +1,205 @@
+# api/app/sudoku/dlx.py
+import threading
+from typing import List, Sequence
+
+# Exact-cover model: 729 candidate rows (cell, digit) over 324 columns.
+#   0..80     cell (r, c) is filled
+#   81..161   row r contains digit d
+#   162..242  column c contains digit d
+#   243..323  box b contains digit d
+N_COLUMNS = 324
+N_CANDIDATES = 729
+ROOT = 0
+FIRST_NODE = N_COLUMNS + 1
+
+
+def _candidate_columns(cell: int, digit: int) -> tuple[int, int, int, int]:
+    """Header indices (1-based) of the four constraints a candidate satisfies."""
+    r, c = divmod(cell, 9)
+    b = (r // 3) * 3 + c // 3
+    return (
+        1 + cell,
+        1 + 81 + r * 9 + digit,
+        1 + 162 + c * 9 + digit,
+        1 + 243 + b * 9 + digit,
+    )
+
+
+class NodeLimit(Exception):
+    """The search tried more rows than ``max_nodes``."""
+
+
+class DancingLinks:
+    """Knuth's Algorithm X over a preallocated, array-backed link matrix.
+
+    The matrix is built once; every solve covers the givens, searches and
+    then uncovers in reverse order, leaving the links exactly as built so
+    the same instance serves the next call without reallocating.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.max_nodes: int | None = None
+        size = FIRST_NODE + N_CANDIDATES * 4
+        self.left = list(range(size))
+        self.right = list(range(size))
+        self.up = list(range(size))
+        self.down = list(range(size))
+        self.column = list(range(size))
+        self.candidate = [-1] * size
+        self.size = [0] * (N_COLUMNS + 1)
+
+        for col in range(N_COLUMNS + 1):
+            self.left[col] = col - 1 if col else N_COLUMNS
+            self.right[col] = col + 1 if col < N_COLUMNS else ROOT
+
+        for cand in range(N_CANDIDATES):
+            cell, digit = divmod(cand, 9)
+            base = FIRST_NODE + cand * 4
+            for k, col in enumerate(_candidate_columns(cell, digit)):
+                node = base + k
+                self.column[node] = col
+                self.candidate[node] = cand
+                self.left[node] = base + (k - 1) % 4
+                self.right[node] = base + (k + 1) % 4
+                self.up[node] = self.up[col]
+                self.down[node] = col
+                self.down[self.up[col]] = node
+                self.up[col] = node
+                self.size[col] += 1
+
+    # ---------------- Link operations ---------------- #
+    def _cover(self, col: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                self.size[self.column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col: int) -> None:
+        left, right, up, down = self.left, self.right, self.up, self.down
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                self.size[self.column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def _select(self, node: int) -> None:
+        self._cover(self.column[node])
+        j = self.right[node]
+        while j != node:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _deselect(self, node: int) -> None:
+        j = self.left[node]
+        while j != node:
+            self._uncover(self.column[j])
+            j = self.left[j]
+        self._uncover(self.column[node])
+
+    # ---------------- Search ---------------- #
+    def _search(self, picked: List[int], limit: int, found: List[List[int]]) -> None:
+        right = self.right
+        if right[ROOT] == ROOT:
+            found.append(picked[:])
+            return
+        col, best = right[ROOT], N_CANDIDATES + 1
+        c = col
+        while c != ROOT:
+            if self.size[c] < best:
+                col, best = c, self.size[c]
+                if best <= 1:
+                    break
+            c = right[c]
+        if best == 0:
+            return
+        row = self.down[col]
+        while row != col and len(found) < limit:
+            self.nodes += 1
+            if self.max_nodes is not None and self.nodes > self.max_nodes:
+                raise NodeLimit(f"node budget of {self.max_nodes} exhausted")
+            picked.append(self.candidate[row])
+            self._select(row)
+            try:
+                self._search(picked, limit, found)
+            finally:
+                # Also on NodeLimit: the links must be restored for reuse.
+                self._deselect(row)
+                picked.pop()
+            row = self.down[row]
+
+    def _run(
+        self, cells: Sequence[int], limit: int, max_nodes: int | None = None
+    ) -> List[List[int]]:
+        self.nodes, self.max_nodes = 0, max_nodes
+        selected: List[int] = []
+        covered = set()
+        found: List[List[int]] = []
+        try:
+            for cell, value in enumerate(cells):
+                if not value:
+                    continue
+                node = FIRST_NODE + (cell * 9 + value - 1) * 4
+                columns = _candidate_columns(cell, value - 1)
+                if covered.intersection(columns):
+                    return found  # conflicting givens
+                covered.update(columns)
+                self._select(node)
+                selected.append(node)
+            self._search([], limit, found)
+            return found
+        finally:
+            for node in reversed(selected):
+                self._deselect(node)
+
+    def solve(
+        self, cells: Sequence[int], max_nodes: int | None = None
+    ) -> List[int] | None:
+        solutions = self._run(cells, 1, max_nodes)
+        if not solutions:
+            return None
+        result = list(cells)
+        for cand in solutions[0]:
+            cell, digit = divmod(cand, 9)
+            result[cell] = digit + 1
+        return result
+
+    def count_solutions(self, cells: Sequence[int], limit: int = 2) -> int:
+        return len(self._run(cells, limit))
+
+
+_local = threading.local()
+
+
+def _matrix() -> DancingLinks:
+    # One matrix per thread: searches mutate the links in place.
+    matrix = getattr(_local, "matrix", None)
+    if matrix is None:
+        matrix = _local.matrix = DancingLinks()
+    return matrix
+
+
+def solve_cells(cells: Sequence[int], max_nodes: int | None = None) -> List[int] | None:
+    """Solve a flat 81-cell board; return the filled cells or None.
+
+    Raises NodeLimit once more than ``max_nodes`` rows have been tried.
+    """
+    return _matrix().solve(cells, max_nodes)
+
+
+def count_solutions(cells: Sequence[int], limit: int = 2) -> int:
+    return _matrix().count_solutions(cells, limit)
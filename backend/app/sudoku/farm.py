@@ -0,0 +1,249 @@
+# api/app/sudoku/farm.py
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Sequence, Set, TextIO, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+from .. import models
+from ..database import engine as default_engine
+from ..models import Difficulty
+from .generator import generate_within
+from .prepare import prepare_boards
+
+# Seeds of one difficulty live in their own range, so targets for several
+# difficulties never reuse a full grid: seed = base + order * STRIDE + k.
+SEED_STRIDE = 1 << 32
+CHUNK_SIZE = 25  # seeds per pool task
+BATCH_SIZE = 1000  # rows per write
+
+Task = Tuple[Difficulty, List[int]]
+
+
+def seed_for(difficulty: Difficulty, k: int, seed_base: int = 0) -> int:
+    return seed_base + list(Difficulty).index(difficulty) * SEED_STRIDE + k
+
+
+def farm_public_id(difficulty: Difficulty, seed: int) -> str:
+    return f"farm-{difficulty.value}-{seed}"
+
+
+def parse_target(value: str) -> Tuple[Difficulty, int]:
+    """``easy=1000`` -> (Difficulty.EASY, 1000)."""
+    name, sep, count = value.partition("=")
+    try:
+        difficulty = Difficulty(name.strip().lower())
+        total = int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected DIFFICULTY=COUNT, got {value!r}")
+    if not sep or total < 0:
+        raise argparse.ArgumentTypeError(f"expected DIFFICULTY=COUNT, got {value!r}")
+    return difficulty, total
+
+
+def farm_chunk(difficulty: Difficulty, seeds: Sequence[int]) -> List[dict]:
+    """Generate and grade one seed range; runs in a pool worker."""
+    pairs = []
+    for seed in seeds:
+        result = generate_within(seed, difficulty)
+        pairs.append((result.puzzle, result.solution))
+    prepared = prepare_boards(pairs)
+    return [
+        {
+            "public_id": farm_public_id(difficulty, seed),
+            "difficulty": difficulty,
+            "initial_board": puzzle,
+            "solution_board": solution,
+            **fields,
+        }
+        for seed, (puzzle, solution), (fields, _) in zip(seeds, pairs, prepared)
+    ]
+
+
+def plan_tasks(
+    targets: Dict[Difficulty, int],
+    done: Set[str],
+    seed_base: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Task]:
+    """Chunks of the seeds still missing from each target.
+
+    A seed's board depends only on the seed, never on the worker that ran it,
+    so a rerun with the same targets and base picks up exactly where the last
+    one stopped.
+    """
+    for difficulty, total in targets.items():
+        seeds = [
+            seed
+            for seed in (seed_for(difficulty, k, seed_base) for k in range(total))
+            if farm_public_id(difficulty, seed) not in done
+        ]
+        for start in range(0, len(seeds), chunk_size):
+            yield difficulty, seeds[start : start + chunk_size]
+
+
+class FileSink:
+    """Appends ``puzzle,solution,difficulty,public_id`` lines to a flat file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def done(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, encoding="ascii") as fh:
+            return {
+                parts[3]
+                for parts in (line.rstrip("\n").split(",") for line in fh)
+                if len(parts) >= 4
+            }
+
+    def write(self, rows: List[dict]) -> None:
+        with open(self.path, "a", encoding="ascii") as fh:
+            fh.writelines(
+                f"{r['initial_board']},{r['solution_board']},"
+                f"{r['difficulty'].value},{r['public_id']}\n"
+                for r in rows
+            )
+
+
+class DatabaseSink:
+    """Inserts rows into ``boards`` with one executemany per batch.
+
+    Farm output is unique per seed; boards equivalent to a stored one are not
+    linked through duplicate_of_id here.
+    """
+
+    def __init__(self, engine: Engine = default_engine):
+        self.engine = engine
+
+    def done(self) -> Set[str]:
+        stmt = select(models.Board.public_id).where(
+            models.Board.public_id.like("farm-%")
+        )
+        with self.engine.connect() as conn:
+            return set(conn.scalars(stmt))
+
+    def write(self, rows: List[dict]) -> None:
+        for row in rows:
+            row["id"] = uuid.uuid4()
+        with self.engine.begin() as conn:
+            conn.execute(insert(models.Board), rows)
+
+
+class Progress:
+    def __init__(self, targets: Dict[Difficulty, int], done: Set[str], out: TextIO):
+        self.targets = targets
+        self.counts = {
+            d: sum(1 for p in done if p.startswith(f"farm-{d.value}-")) for d in targets
+        }
+        self.made = 0
+        self.started = time.monotonic()
+        self.out = out
+
+    def add(self, difficulty: Difficulty, n: int) -> None:
+        self.counts[difficulty] += n
+        self.made += n
+
+    def report(self) -> None:
+        rate = self.made / max(time.monotonic() - self.started, 1e-9)
+        parts = " ".join(
+            f"{d.value} {min(self.counts[d], t)}/{t}" for d, t in self.targets.items()
+        )
+        total = sum(self.targets.values())
+        have = sum(min(self.counts[d], t) for d, t in self.targets.items())
+        pct = 100.0 * have / total if total else 100.0
+        print(f"[farm] {parts} ({pct:.1f}%) {rate:.1f} boards/s", file=self.out)
+
+
+def run(
+    targets: Dict[Difficulty, int],
+    sink,
+    workers: int | None = None,
+    seed_base: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    batch_size: int = BATCH_SIZE,
+    out: TextIO = sys.stderr,
+) -> int:
+    """Fill every target through ``sink``; returns the number of new boards.
+
+    At most two tasks per worker are in flight, so memory stays bounded no
+    matter how large the targets are.
+    """
+    done = sink.done()
+    progress = Progress(targets, done, out)
+    tasks = plan_tasks(targets, done, seed_base, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    pending: List[dict] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running: Dict[Future, Difficulty] = {}
+
+        def fill() -> None:
+            while len(running) < workers * 2:
+                task = next(tasks, None)
+                if task is None:
+                    return
+                running[pool.submit(farm_chunk, *task)] = task[0]
+
+        fill()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                rows = fut.result()
+                pending.extend(rows)
+                progress.add(running.pop(fut), len(rows))
+            if len(pending) >= batch_size:
+                sink.write(pending)
+                pending = []
+                progress.report()
+            fill()
+    if pending:
+        sink.write(pending)
+        progress.report()
+    return progress.made
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.app.sudoku.farm",
+        description="Generate graded boards offline across all cores.",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        type=parse_target,
+        required=True,
+        metavar="DIFFICULTY=COUNT",
+        help="boards wanted for a difficulty; repeatable",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="append to a flat file instead of the boards table",
+    )
+    args = parser.parse_args(argv)
+
+    sink = FileSink(args.output) if args.output else DatabaseSink()
+    made = run(
+        dict(args.target),
+        sink,
+        workers=args.workers,
+        seed_base=args.seed_base,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+    )
+    print(f"[farm] wrote {made} boards", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,15 @@
 # api/app/sudoku/generator.py
 import random
-from typing import List, Tuple
+import time
+from typing import List, NamedTuple, Sequence, Tuple
 
 from ..models import Difficulty
+from .grader import Technique, grade_cells
+from .grid import Grid
+from .solver import BitBoard, BudgetExceeded, solve_cells
+from .transforms import derive_grid
 
-Board = List[List[int]]
+Board = Grid
 
 DIFFICULTY_TO_CLUES = {
     "easy": 36,
@@ -15,97 +20,123 @@ DIFFICULTY_TO_CLUES = {
     "extreme": 12,
 }
 
+# Greedy carving bottoms out around 22-26 clues, so the clue targets alone
+# cannot tell the harder levels apart. These are graded instead: a carve is
+# accepted once its rating (grader.Technique) falls in the level's range. The
+# ranges are disjoint and rise with the level, hard included, so a harder
+# level never needs an easier technique set than the one below it.
+DIFFICULTY_TO_RATINGS = {
+    "hard": (Technique.NONE, Technique.NAKED_SINGLE),
+    "expert": (Technique.HIDDEN_SINGLE, Technique.HIDDEN_SINGLE),
+    "master": (Technique.NAKED_SUBSET, Technique.SWORDFISH),
+    "extreme": (Technique.SEARCH, Technique.SEARCH),
+}
+# Default attempts per generation: rated levels need several carves to land
+# in range (hard, the rarest, about one 28-clue carve in twelve).
+MAX_ATTEMPTS = 8
+RATED_MAX_ATTEMPTS = 64
+
 
 def seeded_rng(seed: int | None) -> random.Random:
     return random.Random(seed if seed is not None else random.randrange(1, 2**31 - 1))
 
 
 def empty_board() -> Board:
-    return [[0] * 9 for _ in range(9)]
+    return Grid()
 
 
 def is_safe(board: Board, row: int, col: int, value: int) -> bool:
-    if any(board[row][i] == value for i in range(9)):
-        return False
-    if any(board[i][col] == value for i in range(9)):
-        return False
-    board_row, board_col = (row // 3) * 3, (col // 3) * 3
-    for i in range(3):
-        for j in range(3):
-            if board[board_row + i][board_col + j] == value:
-                return False
-    return True
+    return board.is_safe(row * 9 + col, value)
 
 
 def find_empty(board: Board) -> Tuple[int, int] | None:
-    for row in range(9):
-        for col in range(9):
-            if board[row][col] == 0:
-                return (row, col)
-    return None
+    i = board.find_empty()
+    return None if i is None else divmod(i, 9)
 
 
 def solve_backtrack(board: Board) -> bool:
-    pos = find_empty(board)
-    if not pos:
-        return True
-    row, col = pos
-    for value in range(1, 10):
-        if is_safe(board, row, col, value):
-            board[row][col] = value
-            if solve_backtrack(board):
-                return True
-            board[row][col] = 0
-    return False
+    """Solve ``board`` in place; return False if it has no solution."""
+    cells = solve_cells(board.cells)
+    if cells is None:
+        return False
+    board.load(cells)
+    return True
+
+
+def solve_str(state: str, max_nodes: int | None = None) -> str | None:
+    """Solve an 81-character board string; None if it has no solution.
+
+    With ``max_nodes`` the search of the configured engine is bounded and
+    raises BudgetExceeded once it runs out.
+    """
+    grid = Grid.from_str(state)
+    cells = solve_cells(grid.cells, max_nodes=max_nodes)
+    return None if cells is None else str(Grid(cells))
 
 
 def to_str(board: Board) -> str:
-    return "".join(str(board[row][col]) for row in range(9) for col in range(9))
+    return str(board)
 
 
 def from_str(string: str) -> Board:
-    return [[int(string[row * 9 + col]) for col in range(9)] for row in range(9)]
+    return Grid.from_str(string)
 
 
 def generate_full(seed: int | None) -> Board:
-    rng = seeded_rng(seed)
-    board = empty_board()
-    # Seed diagonal boxes to speed up solving
-    nums = list(range(1, 10))
-    for key in range(0, 9, 3):
-        rng.shuffle(nums)
-        idx = 0
-        for i in range(3):
-            for j in range(3):
-                board[key + i][key + j] = nums[idx]
-                idx += 1
-    solve_backtrack(board)
-    return board
+    """Derive a solution grid from the grid bank using seed-chosen symmetries."""
+    return Grid(derive_grid(seeded_rng(seed)))
 
 
-def carve_to_clues(full: Board, clues: int, seed: int | None) -> Board:
-    """Remove exactly 81 - clues cells (target clue count)."""
-    rng = seeded_rng(seed if seed is not None else 0)
-    coords = [(row, col) for row in range(9) for col in range(9)]
-    rng.shuffle(coords)
+def _carve(
+    full: Sequence[int],
+    clues: int,
+    rng: random.Random,
+    max_nodes: int | None = None,
+    deadline: float | None = None,
+) -> bytearray:
+    """Carve a flat grid toward ``clues`` clues.
+
+    If the budget runs out, the result is the puzzle as it stood after the
+    last removal that was verified unique.
+    """
+    order = list(range(81))
+    rng.shuffle(order)
 
     target_holes = 81 - clues
-    board = [row[:] for row in full]
-    removed = 0
-    for row, col in coords:
-        if removed >= target_holes:
-            break
-        if board[row][col] == 0:
-            continue
-        backup = board[row][col]
-        board[row][col] = 0
-        # Keep a light check: board remains solvable.
-        copy = [row[:] for row in board]
-        if solve_backtrack(copy):
-            removed += 1
-        else:
-            board[row][col] = backup
-    return board
+    # One search state for the whole carve: clear() and count_solutions()
+    # leave the masks consistent, so nothing is copied or rebuilt per removal.
+    state = BitBoard(full)
+    state.max_nodes = max_nodes
+    state.deadline = deadline
+    holes: List[int] = []
+    try:
+        for index in order:
+            if len(holes) >= target_holes:
+                break
+            backup = state.cells[index]
+            if backup == 0:
+                continue
+            state.clear(index)
+            if state.count_solutions(2) == 1:
+                holes.append(index)
+            else:
+                state.place(index, backup)
+    except BudgetExceeded:
+        pass
+    cells = bytearray(full)
+    for index in holes:
+        cells[index] = 0
+    return cells
+
+
+def carve_to_clues(full: Board, clues: int, seed: int | None) -> Board:
+    """Remove up to 81 - clues cells while the solution stays unique.
+
+    Stops early (leaving more clues than requested) when no further cell can
+    be removed without a second solution appearing.
+    """
+    rng = seeded_rng(seed if seed is not None else 0)
+    return Grid.from_bytes(_carve(full.cells, clues, rng))
 
 
 def clues_for(d: str | Difficulty) -> int:
@@ -116,9 +147,88 @@ def clues_for(d: str | Difficulty) -> int:
     return value
 
 
-def generate_puzzle(seed: int | None, difficulty: str | Difficulty) -> tuple[str, str]:
+def ratings_for(d: str | Difficulty) -> Tuple[int, int] | None:
+    """Accepted rating range of a graded level, or None for clue-only ones."""
+    clues_for(d)  # validates the name
+    name = d.value if isinstance(d, Difficulty) else str(d).lower()
+    return DIFFICULTY_TO_RATINGS.get(name)
+
+
+class GenerationResult(NamedTuple):
+    puzzle: str
+    solution: str
+    clues: int
+    target_clues: int
+    attempts: int
+    rating: int | None = None  # set for graded levels
+    target_ratings: Tuple[int, int] | None = None
+
+    @property
+    def reached_target(self) -> bool:
+        if self.target_ratings is not None:
+            low, high = self.target_ratings
+            return self.rating is not None and low <= self.rating <= high
+        return self.clues <= self.target_clues
+
+
+def _rating_miss(rating: int, ratings: Tuple[int, int]) -> int:
+    low, high = ratings
+    return max(low - rating, rating - high, 0)
+
+
+def generate_within(
+    seed: int | None,
+    difficulty: str | Difficulty,
+    timeout: float | None = None,
+    max_nodes: int | None = None,
+    max_attempts: int | None = None,
+) -> GenerationResult:
+    """Generate a puzzle under a wall-clock and/or per-attempt node budget.
+
+    Each attempt carves with a fresh removal order; a new attempt starts when
+    the previous one ran out of nodes or stopped short of the target. Graded
+    levels (DIFFICULTY_TO_RATINGS) also grade each carve and stop at the
+    first one in range. The result is the closest puzzle seen, with its
+    actual clue count.
+    """
     clues = clues_for(difficulty)
-    full = generate_full(clues)
-    solution = to_str(full)
-    puzzle = to_str(carve_to_clues(full, clues, seed))
-    return puzzle, solution
+    ratings = ratings_for(difficulty)
+    if max_attempts is None:
+        max_attempts = MAX_ATTEMPTS if ratings is None else RATED_MAX_ATTEMPTS
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    rng = seeded_rng(seed)
+    full = bytearray(derive_grid(seeded_rng(seed)))
+    best, best_key, rating = full, None, None
+    attempts = 0
+    while attempts < max_attempts:
+        if attempts and deadline is not None and time.monotonic() > deadline:
+            break
+        attempts += 1
+        cells = _carve(full, clues, rng, max_nodes, deadline)
+        count = 81 - cells.count(0)
+        if ratings is None:
+            key = (max(count - clues, 0), count)
+            graded = None
+        else:
+            graded = int(grade_cells(cells).technique)
+            key = (_rating_miss(graded, ratings), count)
+        if best_key is None or key < best_key:
+            best, best_key, rating = cells, key, graded
+        if best_key[0] == 0:
+            break
+    return GenerationResult(
+        puzzle=str(Grid.from_bytes(best)),
+        solution=str(Grid.from_bytes(full)),
+        clues=81 - best.count(0),
+        target_clues=clues,
+        attempts=attempts,
+        rating=rating,
+        target_ratings=ratings,
+    )
+
+
+def generate_puzzle(seed: int | None, difficulty: str | Difficulty) -> tuple[str, str]:
+    # Clue-only levels keep their single carve; graded ones need retries.
+    attempts = 1 if ratings_for(difficulty) is None else None
+    result = generate_within(seed, difficulty, max_attempts=attempts)
+    return result.puzzle, result.solution
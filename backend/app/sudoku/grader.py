@@ -0,0 +1,220 @@
+# api/app/sudoku/grader.py
+from enum import IntEnum
+from itertools import combinations
+from typing import Callable, List, NamedTuple, Sequence
+
+from .solver import ALL_DIGITS, BOX_OF, COL_OF, PEERS, ROW_OF, UNITS, BitBoard
+
+ROWS, COLS, BOXES = UNITS[:9], UNITS[9:18], UNITS[18:]
+DIGITS = range(1, 10)
+
+
+class Technique(IntEnum):
+    """Human solving techniques, ordered from easiest to hardest."""
+
+    NONE = 0  # already solved
+    NAKED_SINGLE = 1
+    HIDDEN_SINGLE = 2
+    NAKED_SUBSET = 3  # naked pairs / triples
+    HIDDEN_SUBSET = 4  # hidden pairs / triples
+    LOCKED_CANDIDATES = 5  # pointing and box/line reduction
+    X_WING = 6
+    SWORDFISH = 7
+    SEARCH = 8  # no technique above applies; needs guessing
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+class Grade(NamedTuple):
+    technique: Technique  # hardest technique needed
+    steps: int  # technique applications until solved or stuck
+    clues: int
+    search_nodes: int  # 0 unless technique is SEARCH
+    solvable: bool
+
+    @property
+    def rating(self) -> int:
+        return int(self.technique)
+
+
+class _Grid:
+    """Cells plus explicit candidate masks that techniques eliminate from."""
+
+    def __init__(self, cells: Sequence[int]):
+        self.cells = list(cells)
+        self.cand = [0 if v else ALL_DIGITS for v in self.cells]
+        for i, v in enumerate(self.cells):
+            if v:
+                self._eliminate_peers(i, 1 << v)
+
+    def _eliminate_peers(self, i: int, bit: int) -> None:
+        for p in PEERS[i]:
+            self.cand[p] &= ~bit
+
+    def place(self, i: int, value: int) -> None:
+        self.cells[i] = value
+        self.cand[i] = 0
+        self._eliminate_peers(i, 1 << value)
+
+    def remove(self, cells: Sequence[int], mask: int) -> bool:
+        changed = False
+        for i in cells:
+            if self.cand[i] & mask:
+                self.cand[i] &= ~mask
+                changed = True
+        return changed
+
+    def positions(self, unit: Sequence[int], digit: int) -> List[int]:
+        bit = 1 << digit
+        return [i for i in unit if self.cand[i] & bit]
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+# ---------------- Techniques ---------------- #
+# Each returns True when it placed a digit or eliminated a candidate.
+
+
+def _naked_single(grid: _Grid) -> bool:
+    for i, mask in enumerate(grid.cand):
+        if mask and mask & (mask - 1) == 0:
+            grid.place(i, mask.bit_length() - 1)
+            return True
+    return False
+
+
+def _hidden_single(grid: _Grid) -> bool:
+    for unit in UNITS:
+        for digit in DIGITS:
+            spots = grid.positions(unit, digit)
+            if len(spots) == 1:
+                grid.place(spots[0], digit)
+                return True
+    return False
+
+
+def _naked_subset(grid: _Grid) -> bool:
+    for size in (2, 3):
+        for unit in UNITS:
+            open_cells = [i for i in unit if 1 < _popcount(grid.cand[i]) <= size]
+            for group in combinations(open_cells, size):
+                union = 0
+                for i in group:
+                    union |= grid.cand[i]
+                if _popcount(union) != size:
+                    continue
+                others = [i for i in unit if i not in group]
+                if grid.remove(others, union):
+                    return True
+    return False
+
+
+def _hidden_subset(grid: _Grid) -> bool:
+    for size in (2, 3):
+        for unit in UNITS:
+            spots = {d: grid.positions(unit, d) for d in DIGITS}
+            digits = [d for d, cells in spots.items() if 1 < len(cells) <= size]
+            for group in combinations(digits, size):
+                cells = set().union(*(spots[d] for d in group))
+                if len(cells) != size:
+                    continue
+                keep = sum(1 << d for d in group)
+                if grid.remove(sorted(cells), ALL_DIGITS & ~keep):
+                    return True
+    return False
+
+
+def _pointing(grid: _Grid, digit: int) -> bool:
+    """A box's candidates for the digit sit on one line: clear the rest of it."""
+    for box in BOXES:
+        spots = grid.positions(box, digit)
+        for lines, line_of in ((ROWS, ROW_OF), (COLS, COL_OF)):
+            if spots and len({line_of[i] for i in spots}) == 1:
+                rest = [i for i in lines[line_of[spots[0]]] if i not in box]
+                if grid.remove(rest, 1 << digit):
+                    return True
+    return False
+
+
+def _box_line(grid: _Grid, digit: int) -> bool:
+    """A line's candidates for the digit sit in one box: clear the rest of it."""
+    for line in ROWS + COLS:
+        boxes = {BOX_OF[i] for i in grid.positions(line, digit)}
+        if len(boxes) == 1:
+            rest = [i for i in BOXES[boxes.pop()] if i not in line]
+            if grid.remove(rest, 1 << digit):
+                return True
+    return False
+
+
+def _locked_candidates(grid: _Grid) -> bool:
+    return any(_pointing(grid, d) or _box_line(grid, d) for d in DIGITS)
+
+
+def _fish(grid: _Grid, size: int) -> bool:
+    for digit in DIGITS:
+        bit = 1 << digit
+        for base, cover in ((ROWS, COLS), (COLS, ROWS)):
+            # For each base line, the indices of cover lines holding the digit.
+            lines = {}
+            for k, line in enumerate(base):
+                spots = grid.positions(line, digit)
+                if 1 < len(spots) <= size:
+                    lines[k] = {line.index(i) for i in spots}
+            for group in combinations(lines, size):
+                covered = set().union(*(lines[k] for k in group))
+                if len(covered) != size:
+                    continue
+                rest = [
+                    i
+                    for c in covered
+                    for i in cover[c]
+                    if all(i not in base[k] for k in group)
+                ]
+                if grid.remove(rest, bit):
+                    return True
+    return False
+
+
+TECHNIQUES: List[tuple[Technique, Callable[[_Grid], bool]]] = [
+    (Technique.NAKED_SINGLE, _naked_single),
+    (Technique.HIDDEN_SINGLE, _hidden_single),
+    (Technique.NAKED_SUBSET, _naked_subset),
+    (Technique.HIDDEN_SUBSET, _hidden_subset),
+    (Technique.LOCKED_CANDIDATES, _locked_candidates),
+    (Technique.X_WING, lambda grid: _fish(grid, 2)),
+    (Technique.SWORDFISH, lambda grid: _fish(grid, 3)),
+]
+
+
+def grade_cells(cells: Sequence[int]) -> Grade:
+    """Solve like a human would and report the hardest technique needed.
+
+    After every successful step the techniques are retried from the easiest,
+    so the rating reflects the simplest path the listed techniques allow.
+    """
+    clues = sum(1 for v in cells if v)
+    if not BitBoard(cells).consistent:
+        return Grade(Technique.SEARCH, 0, clues, 0, False)
+    grid = _Grid(cells)
+    hardest, steps = Technique.NONE, 0
+    while 0 in grid.cells:
+        for technique, apply in TECHNIQUES:
+            if apply(grid):
+                hardest = max(hardest, technique)
+                steps += 1
+                break
+        else:
+            # Stuck (or contradicted): finish with search and count its nodes.
+            search = BitBoard(grid.cells)
+            solvable = search.solve()
+            return Grade(Technique.SEARCH, steps, clues, search.nodes, solvable)
+    solvable = BitBoard(grid.cells).consistent
+    return Grade(hardest, steps, clues, 0, solvable)
+
+
+def grade_puzzle(puzzle: str) -> Grade:
+    return grade_cells([int(ch) for ch in puzzle])
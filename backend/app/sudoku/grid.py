@@ -0,0 +1,147 @@
+# api/app/sudoku/grid.py
+from typing import Iterator, List, Sequence
+
+from .solver import ALL_DIGITS, BOX_OF, COL_OF, ROW_OF, UNITS
+
+# bytes.translate tables between ASCII digits and raw cell values 0..9.
+_FROM_ASCII = bytes(range(256)).replace(b"0123456789", bytes(range(10)))
+_TO_ASCII = bytes(range(256)).replace(bytes(range(10)), b"0123456789")
+
+
+class Grid:
+    """A board as one flat ``bytearray(81)`` plus cached unit digit masks.
+
+    Cell ``i`` is row ``i // 9``, column ``i % 9``; 0 is a blank. ``rows``,
+    ``cols`` and ``boxes`` hold, per unit, a mask of the digits placed in it
+    (bit ``v`` for digit ``v``) and are kept current by ``__setitem__``.
+    """
+
+    __slots__ = ("cells", "rows", "cols", "boxes")
+
+    def __init__(self, cells: Sequence[int] | None = None):
+        self.cells = bytearray(81) if cells is None else bytearray(cells)
+        if len(self.cells) != 81:
+            raise ValueError("grid must have exactly 81 cells")
+        self._rebuild()
+
+    @classmethod
+    def from_bytes(cls, data: bytearray | bytes) -> "Grid":
+        """Wrap raw cell values; a bytearray is shared, not copied."""
+        if not isinstance(data, bytearray):
+            return cls(data)
+        grid = cls.__new__(cls)
+        grid.cells = data
+        if len(data) != 81 or max(data) > 9:
+            raise ValueError("grid must have exactly 81 cells valued 0-9")
+        grid._rebuild()
+        return grid
+
+    @classmethod
+    def from_str(cls, board: str) -> "Grid":
+        raw = board.encode("ascii", errors="replace")
+        if len(raw) != 81 or not raw.isdigit():
+            raise ValueError("board must be 81 digits (0-9)")
+        return cls.from_bytes(bytearray(raw.translate(_FROM_ASCII)))
+
+    def _rebuild(self) -> None:
+        self.rows, self.cols, self.boxes = [0] * 9, [0] * 9, [0] * 9
+        for i, v in enumerate(self.cells):
+            if v:
+                bit = 1 << v
+                self.rows[ROW_OF[i]] |= bit
+                self.cols[COL_OF[i]] |= bit
+                self.boxes[BOX_OF[i]] |= bit
+
+    def _unit_mask(self, unit: int) -> int:
+        mask = 0
+        for i in UNITS[unit]:
+            mask |= 1 << self.cells[i]
+        return mask & ALL_DIGITS
+
+    # ---------------- Cells ---------------- #
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: int) -> None:
+        old = self.cells[i]
+        if old == value:
+            return
+        self.cells[i] = value
+        r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+        if old:
+            # A duplicate may still hold the old digit, so rescan those units.
+            self.rows[r] = self._unit_mask(r)
+            self.cols[c] = self._unit_mask(9 + c)
+            self.boxes[b] = self._unit_mask(18 + b)
+        if value:
+            bit = 1 << value
+            self.rows[r] |= bit
+            self.cols[c] |= bit
+            self.boxes[b] |= bit
+
+    def __len__(self) -> int:
+        return 81
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.cells)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and self.cells == other.cells
+
+    __hash__ = None  # mutable
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.cells)
+
+    def __str__(self) -> str:
+        return self.cells.translate(_TO_ASCII).decode("ascii")
+
+    def __repr__(self) -> str:
+        return f"Grid({str(self)!r})"
+
+    def copy(self) -> "Grid":
+        grid = Grid.__new__(Grid)
+        grid.cells = self.cells[:]
+        grid.rows, grid.cols, grid.boxes = self.rows[:], self.cols[:], self.boxes[:]
+        return grid
+
+    def load(self, cells: Sequence[int]) -> None:
+        """Overwrite every cell in place."""
+        self.cells[:] = bytes(cells)
+        self._rebuild()
+
+    # ---------------- Queries ---------------- #
+    @property
+    def clues(self) -> int:
+        return 81 - self.cells.count(0)
+
+    def is_full(self) -> bool:
+        return 0 not in self.cells
+
+    def candidates(self, i: int) -> int:
+        used = self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]]
+        return ALL_DIGITS & ~used
+
+    def is_safe(self, i: int, value: int) -> bool:
+        return bool(self.candidates(i) >> value & 1)
+
+    def find_empty(self) -> int | None:
+        i = self.cells.find(0)
+        return None if i < 0 else i
+
+    def conflicts(self) -> List[int]:
+        """Sorted indices of filled cells that repeat a digit in some unit."""
+        masks = self.rows + self.cols + self.boxes
+        bad = set()
+        for unit, mask in zip(UNITS, masks):
+            filled = [i for i in unit if self.cells[i]]
+            if len(filled) == bin(mask).count("1"):
+                continue  # every digit in this unit is distinct
+            seen = {}
+            for i in filled:
+                v = self.cells[i]
+                if v in seen:
+                    bad.update((i, seen[v]))
+                else:
+                    seen[v] = i
+        return sorted(bad)
@@ -0,0 +1,250 @@
+# api/app/sudoku/importer.py
+import argparse
+import asyncio
+import itertools
+import os
+import re
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, TextIO, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..crud.boards import insert_prepared
+from ..database import AsyncSessionLocal, dispose_async_engine, get_async_engine
+from ..models import Difficulty
+from ..schemas import _validate_board_str
+from .codec import puzzle_hash
+from .generator import DIFFICULTY_TO_CLUES, DIFFICULTY_TO_RATINGS
+from .prepare import prepare_boards
+from .solver import solve_cells
+
+CHUNK_SIZE = 1000  # lines per pool task and per INSERT
+MAX_REPORTED_ERRORS = 20
+
+_SEPARATORS = re.compile(r"[,;|\s]+")
+_DIFFICULTIES = {d.value for d in Difficulty}
+
+
+class ImportRow(NamedTuple):
+    """One parsed line; carries the fields crud.insert_prepared reads."""
+
+    public_id: str
+    difficulty: Difficulty | None
+    initial_board: str
+    solution_board: str | None
+
+
+class ImportStats:
+    def __init__(self, out: TextIO):
+        self.lines = self.inserted = self.rejected = 0
+        self.started = time.monotonic()
+        self.out = out
+
+    def reject(self, line_no: int, error: str) -> None:
+        self.rejected += 1
+        if self.rejected <= MAX_REPORTED_ERRORS:
+            print(f"[import] line {line_no}: {error}", file=self.out)
+
+    def report(self) -> None:
+        rate = self.lines / max(time.monotonic() - self.started, 1e-9)
+        print(
+            f"[import] {self.lines} lines, {self.inserted} inserted, "
+            f"{self.rejected} rejected ({rate:.0f} lines/s)",
+            file=self.out,
+        )
+
+
+def difficulty_for_grade(clues: int, rating: int) -> Difficulty:
+    """The level the generator files a puzzle under.
+
+    Above the hard clue target only the clue count matters (easy, medium);
+    at or below it the rating picks the graded level (DIFFICULTY_TO_RATINGS).
+    """
+    graded_clues = max(DIFFICULTY_TO_CLUES[name] for name in DIFFICULTY_TO_RATINGS)
+    if clues <= graded_clues:
+        for name, (low, high) in DIFFICULTY_TO_RATINGS.items():
+            if low <= rating <= high:
+                return Difficulty(name)
+    found = Difficulty.EASY
+    for name, target in DIFFICULTY_TO_CLUES.items():
+        if name not in DIFFICULTY_TO_RATINGS and clues <= target:
+            found = Difficulty(name)
+    return found
+
+
+def parse_line(line: str, prefix: str) -> ImportRow | None:
+    """``puzzle[ solution[ difficulty ...]]``, split on commas, semicolons,
+    bars or whitespace; a third column that is not a difficulty name is
+    ignored. Blank and ``#`` lines give None; bad rows raise ValueError with
+    the BoardCreate message."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    fields = _SEPARATORS.split(line)
+    puzzle = _validate_board_str(
+        fields[0].replace(".", "0"), field_name="initial_board"
+    )
+    solution = None
+    if len(fields) > 1 and fields[1]:
+        solution = _validate_board_str(fields[1], field_name="solution_board")
+        for i in range(81):
+            if puzzle[i] != "0" and puzzle[i] != solution[i]:
+                raise ValueError(
+                    f"solution_board conflicts with initial_board at index {i}"
+                )
+    difficulty = None
+    if len(fields) > 2 and fields[2].lower() in _DIFFICULTIES:
+        difficulty = Difficulty(fields[2].lower())
+    public_id = f"{prefix}-{puzzle_hash(puzzle) & 0xFFFFFFFFFFFFFFFF:016x}"
+    return ImportRow(public_id, difficulty, puzzle, solution)
+
+
+def prepare_import(
+    rows: Sequence[Tuple[int, ImportRow]], difficulty: Difficulty | None = None
+) -> Tuple[List[Tuple[int, ImportRow]], list, List[Tuple[int, str]]]:
+    """Solve missing solutions, then grade; runs in a pool worker.
+
+    Returns the completed rows, their ``prepare_boards`` output and the
+    (line, error) pairs of puzzles with no solution. Rows without a
+    difficulty get ``difficulty``, or else the one their grade maps to.
+    """
+    complete, errors = [], []
+    for line_no, row in rows:
+        solution = row.solution_board
+        if solution is None:
+            cells = solve_cells([int(ch) for ch in row.initial_board])
+            if cells is None:
+                errors.append((line_no, "initial_board has no solution"))
+                continue
+            solution = "".join(map(str, cells))
+        complete.append((line_no, row._replace(solution_board=solution)))
+    prepared = prepare_boards(
+        [(row.initial_board, row.solution_board) for _, row in complete]
+    )
+    for k, ((line_no, row), (fields, _)) in enumerate(zip(complete, prepared)):
+        if row.difficulty is None:
+            found = difficulty or difficulty_for_grade(
+                fields["clue_count"], fields["rating"]
+            )
+            complete[k] = (line_no, row._replace(difficulty=found))
+    return complete, prepared, errors
+
+
+def iter_chunks(
+    lines: Iterable[str], prefix: str, stats: ImportStats, chunk_size: int
+) -> Iterator[List[Tuple[int, ImportRow]]]:
+    """Parsed rows a chunk at a time; only one chunk of lines is held."""
+    numbered = enumerate(lines, start=1)
+    while True:
+        batch = list(itertools.islice(numbered, chunk_size))
+        if not batch:
+            return
+        stats.lines += len(batch)
+        rows = []
+        for line_no, line in batch:
+            try:
+                row = parse_line(line, prefix)
+            except ValueError as exc:
+                stats.reject(line_no, str(exc))
+                continue
+            if row is not None:
+                rows.append((line_no, row))
+        if rows:
+            yield rows
+
+
+async def import_lines(
+    db: AsyncSession,
+    lines: Iterable[str],
+    pool: Executor | None = None,
+    workers: int = 1,
+    prefix: str = "import",
+    difficulty: Difficulty | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    out: TextIO = sys.stderr,
+) -> ImportStats:
+    """Stream ``lines`` into ``boards``, committing after every chunk.
+
+    At most two chunks per worker are in flight and inserted rows are not
+    kept, so memory does not grow with the input. Earlier chunks are
+    committed, so duplicates of them are found through the database.
+    ``pool=None`` prepares chunks on the loop's default executor.
+    """
+    stats = ImportStats(out)
+    loop = asyncio.get_running_loop()
+    running: set = set()
+
+    async def store(done: set) -> None:
+        for fut in done:
+            complete, prepared, errors = fut.result()
+            for line_no, error in errors:
+                stats.reject(line_no, error)
+            results = await insert_prepared(db, complete, prepared, {}, set())
+            await db.commit()
+            for line_no, (board_id, error) in sorted(results.items()):
+                if board_id is None:
+                    stats.reject(line_no, error)
+                else:
+                    stats.inserted += 1
+        stats.report()
+
+    for rows in iter_chunks(lines, prefix, stats, chunk_size):
+        running.add(loop.run_in_executor(pool, prepare_import, rows, difficulty))
+        if len(running) >= workers * 2:
+            done, running = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            await store(done)
+    if running:
+        done, _ = await asyncio.wait(running)
+        await store(done)
+    return stats
+
+
+async def _main(args: argparse.Namespace) -> ImportStats:
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    try:
+        get_async_engine()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            async with AsyncSessionLocal() as db:
+                return await import_lines(
+                    db,
+                    source,
+                    pool=pool,
+                    workers=args.workers,
+                    prefix=args.prefix,
+                    difficulty=args.difficulty,
+                    chunk_size=args.chunk_size,
+                )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        await dispose_async_engine()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.app.sudoku.importer",
+        description="Stream a puzzle corpus (one 81-char puzzle per line, "
+        "'.' or '0' for blanks, optional solution column) into boards.",
+    )
+    parser.add_argument("file", nargs="?", default="-", help="path, or - for stdin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--prefix", default="import", help="public_id prefix (<prefix>-<hash>)"
+    )
+    parser.add_argument(
+        "--difficulty",
+        type=Difficulty,
+        help="for rows without a difficulty column; default: from the grade",
+    )
+    args = parser.parse_args(argv)
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
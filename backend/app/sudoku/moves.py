@@ -0,0 +1,71 @@
+# api/app/sudoku/moves.py
+import base64
+import binascii
+from typing import List, Set, Tuple
+
+from .grid import Grid
+from .solver import CELL_UNITS, PEERS, UNITS
+
+
+def encode_token(grid: Grid) -> str:
+    """Opaque state token: the raw cells, base64url-encoded."""
+    return base64.urlsafe_b64encode(grid.cells).decode("ascii")
+
+
+def decode_token(token: str) -> Grid:
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError) as exc:
+        raise ValueError("malformed state token") from exc
+    return Grid.from_bytes(bytearray(raw))
+
+
+class MoveTracker:
+    """Per-unit digit counters over a Grid, for validating one move at a time.
+
+    A unit's counters are built the first time a move touches it, so a
+    tracker rebuilt from a token only ever scans the few units a move
+    affects; a long-lived tracker reuses them for every later move.
+    """
+
+    __slots__ = ("grid", "_counts")
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self._counts: List[bytearray | None] = [None] * 27
+
+    def _unit(self, unit: int) -> bytearray:
+        counts = self._counts[unit]
+        if counts is None:
+            counts = bytearray(10)
+            cells = self.grid.cells
+            for i in UNITS[unit]:
+                counts[cells[i]] += 1
+            self._counts[unit] = counts
+        return counts
+
+    def is_conflicted(self, i: int) -> bool:
+        value = self.grid.cells[i]
+        return bool(value) and any(self._unit(u)[value] > 1 for u in CELL_UNITS[i])
+
+    def _conflicted(self, cells: Set[int]) -> Set[int]:
+        return {i for i in cells if self.is_conflicted(i)}
+
+    def apply(self, index: int, value: int) -> Tuple[List[int], List[int]]:
+        """Set one cell; return the cells that (started, stopped) conflicting."""
+        cells = self.grid.cells
+        old = cells[index]
+        if old == value:
+            return [], []
+        # Only the cell itself and peers holding the old or new digit can flip.
+        touched = {index} | {
+            j for j in PEERS[index] if cells[j] and cells[j] in (old, value)
+        }
+        before = self._conflicted(touched)
+        for u in CELL_UNITS[index]:
+            counts = self._unit(u)
+            counts[old] -= 1
+            counts[value] += 1
+        self.grid[index] = value
+        after = self._conflicted(touched)
+        return sorted(after - before), sorted(before - after)
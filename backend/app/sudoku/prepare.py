@@ -0,0 +1,42 @@
+# api/app/sudoku/prepare.py
+from typing import List, Sequence, Tuple
+
+from .canonical import Canonical, canonical_form
+from .codec import puzzle_hash
+from .grader import grade_puzzle
+
+# Board columns filled in by the grader.
+GRADE_FIELDS = ("rating", "technique", "steps", "clue_count", "search_nodes")
+
+
+def grade_fields(initial_board: str) -> dict:
+    grade = grade_puzzle(initial_board)
+    return {
+        "rating": grade.rating,
+        "technique": str(grade.technique),
+        "steps": grade.steps,
+        "clue_count": grade.clues,
+        "search_nodes": grade.search_nodes,
+    }
+
+
+def derived_fields(initial_board: str, solution_board: str) -> dict:
+    """Board columns computed from the two board strings, except the grade."""
+    return {"puzzle_hash": puzzle_hash(initial_board)}
+
+
+def prepare_boards(
+    pairs: Sequence[Tuple[str, str]],
+) -> List[Tuple[dict, Canonical | None]]:
+    """Derived columns, grade and canonical form for many (initial, solution)
+    pairs; the CPU-bound part of a bulk insert, run in the compute pool."""
+    prepared = []
+    for initial_board, solution_board in pairs:
+        canonical = canonical_form(initial_board)
+        fields = {
+            **derived_fields(initial_board, solution_board),
+            **grade_fields(initial_board),
+            "canonical_hash": canonical.hash if canonical is not None else None,
+        }
+        prepared.append((fields, canonical))
+    return prepared
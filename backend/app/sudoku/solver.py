@@ -0,0 +1,269 @@
+# api/app/sudoku/solver.py
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from ..settings import settings
+from . import dlx
+
+# Candidate sets are 9-bit masks using bits 1..9 (bit v set -> digit v allowed).
+ALL_DIGITS = 0x3FE
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+
+UNITS: List[List[int]] = (
+    [[r * 9 + c for c in range(9)] for r in range(9)]
+    + [[r * 9 + c for r in range(9)] for c in range(9)]
+    + [
+        [(br + i) * 9 + bc + j for i in range(3) for j in range(3)]
+        for br in range(0, 9, 3)
+        for bc in range(0, 9, 3)
+    ]
+)
+# For every cell, the indices of its row, column and box in UNITS.
+CELL_UNITS: List[Tuple[int, int, int]] = [
+    (ROW_OF[i], 9 + COL_OF[i], 18 + BOX_OF[i]) for i in range(81)
+]
+PEERS: List[List[int]] = [
+    sorted({j for u in CELL_UNITS[i] for j in UNITS[u]} - {i}) for i in range(81)
+]
+
+
+class BudgetExceeded(Exception):
+    """Raised when a search runs past its node budget or deadline."""
+
+
+class BitBoard:
+    """Flat 81-cell board with per-row, per-column and per-box digit masks.
+
+    Search always branches on the most-constrained empty cell after
+    propagating naked and hidden singles, and undoes its own placements
+    on backtrack so one instance can be searched repeatedly.
+
+    ``max_nodes`` and ``deadline`` (a ``time.monotonic()`` value) bound the
+    search; exceeding either raises BudgetExceeded and leaves the board in an
+    unspecified state.
+    """
+
+    __slots__ = (
+        "cells",
+        "rows",
+        "cols",
+        "boxes",
+        "consistent",
+        "nodes",
+        "max_nodes",
+        "deadline",
+    )
+
+    def __init__(self, cells: Sequence[int]):
+        self.cells = list(cells)
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.consistent = True
+        self.nodes = 0
+        self.max_nodes: int | None = None
+        self.deadline: float | None = None
+        for i, value in enumerate(self.cells):
+            if not value:
+                continue
+            bit = 1 << value
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+                self.consistent = False
+            self.rows[r] |= bit
+            self.cols[c] |= bit
+            self.boxes[b] |= bit
+
+    def candidates(self, i: int) -> int:
+        return ALL_DIGITS & ~(
+            self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]]
+        )
+
+    def place(self, i: int, value: int) -> None:
+        bit = 1 << value
+        self.cells[i] = value
+        self.rows[ROW_OF[i]] |= bit
+        self.cols[COL_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+
+    def clear(self, i: int) -> None:
+        mask = ~(1 << self.cells[i])
+        self.cells[i] = 0
+        self.rows[ROW_OF[i]] &= mask
+        self.cols[COL_OF[i]] &= mask
+        self.boxes[BOX_OF[i]] &= mask
+
+    def solve(self) -> bool:
+        """Fill the board with the first solution found; False if none."""
+        if not self.consistent:
+            return False
+        return self._search(1, keep=True) == 1
+
+    def count_solutions(self, limit: int = 2) -> int:
+        """Count solutions, stopping at ``limit``. The board is left unchanged."""
+        if not self.consistent:
+            return 0
+        return self._search(limit, keep=False)
+
+    # ---------------- Search ---------------- #
+    def _propagate(self, trail: List[int]) -> bool:
+        """Place naked and hidden singles until stuck; False on contradiction."""
+        while True:
+            progress = self._naked_singles(trail)
+            if progress is None:
+                return False
+            if progress:
+                continue
+            progress = self._hidden_singles(trail)
+            if progress is None:
+                return False
+            if not progress:
+                return True
+
+    def _naked_singles(self, trail: List[int]) -> bool | None:
+        cells = self.cells
+        progress = False
+        for i in range(81):
+            if cells[i]:
+                continue
+            mask = self.candidates(i)
+            if not mask:
+                return None
+            if mask & (mask - 1) == 0:
+                self.place(i, mask.bit_length() - 1)
+                trail.append(i)
+                progress = True
+        return progress
+
+    def _hidden_singles(self, trail: List[int]) -> bool | None:
+        cells = self.cells
+        progress = False
+        for unit in UNITS:
+            once = twice = placed = 0
+            for i in unit:
+                if cells[i]:
+                    placed |= 1 << cells[i]
+                else:
+                    mask = self.candidates(i)
+                    twice |= once & mask
+                    once |= mask
+            if (once | placed) != ALL_DIGITS:
+                return None
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                spot = next(
+                    (i for i in unit if not cells[i] and self.candidates(i) & bit), -1
+                )
+                if spot < 0:
+                    # An earlier hidden single in this unit took the last spot.
+                    return None
+                self.place(spot, bit.bit_length() - 1)
+                trail.append(spot)
+                progress = True
+        return progress
+
+    def _most_constrained(self) -> Tuple[int, int]:
+        best, best_mask, best_count = -1, 0, 10
+        cells = self.cells
+        for i in range(81):
+            if cells[i]:
+                continue
+            mask = self.candidates(i)
+            count = bin(mask).count("1")
+            if count < best_count:
+                best, best_mask, best_count = i, mask, count
+                if count <= 2:
+                    break
+        return best, best_mask
+
+    def _undo(self, trail: List[int]) -> None:
+        for i in reversed(trail):
+            self.clear(i)
+
+    def _check_budget(self) -> None:
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded(f"node budget of {self.max_nodes} exhausted")
+        # Reading the clock is comparatively slow; do it every 64 nodes.
+        if self.deadline is not None and not self.nodes & 63:
+            if time.monotonic() > self.deadline:
+                raise BudgetExceeded("deadline passed")
+
+    def _search(self, limit: int, keep: bool) -> int:
+        self.nodes += 1
+        self._check_budget()
+        trail: List[int] = []
+        if not self._propagate(trail):
+            self._undo(trail)
+            return 0
+        i, mask = self._most_constrained()
+        if i < 0:
+            if not keep:
+                self._undo(trail)
+            return 1
+        found = 0
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            self.place(i, bit.bit_length() - 1)
+            found += self._search(limit - found, keep)
+            if keep and found >= limit:
+                return found
+            self.clear(i)
+            if found >= limit:
+                break
+        self._undo(trail)
+        return found
+
+
+def _solve_bitmask(
+    cells: Sequence[int], max_nodes: int | None = None
+) -> List[int] | None:
+    board = BitBoard(cells)
+    board.max_nodes = max_nodes
+    return board.cells if board.solve() else None
+
+
+def _solve_dlx(cells: Sequence[int], max_nodes: int | None = None) -> List[int] | None:
+    try:
+        return dlx.solve_cells(cells, max_nodes)
+    except dlx.NodeLimit as exc:
+        raise BudgetExceeded(str(exc)) from exc
+
+
+ENGINES: Dict[str, Callable[[Sequence[int], int | None], List[int] | None]] = {
+    "bitmask": _solve_bitmask,
+    "dlx": _solve_dlx,
+}
+
+
+def solve_cells(
+    cells: Sequence[int], engine: str | None = None, max_nodes: int | None = None
+) -> List[int] | None:
+    """Solve a flat 81-cell board; return the filled cells or None.
+
+    ``engine`` defaults to ``settings.solver_engine``. With ``max_nodes`` the
+    search raises BudgetExceeded once it passes that many nodes.
+    """
+    name = engine or settings.solver_engine
+    solve = ENGINES.get(name)
+    if solve is None:
+        raise ValueError(f"Unknown solver engine: {name}")
+    return solve(cells, max_nodes)
+
+
+def is_solution(puzzle: str, solution: str) -> bool:
+    """True if ``solution`` is a complete, conflict-free grid keeping the givens."""
+    if len(puzzle) != 81 or len(solution) != 81 or "0" in solution:
+        return False
+    if any(p != "0" and p != s for p, s in zip(puzzle, solution)):
+        return False
+    return BitBoard([int(ch) for ch in solution]).consistent
+
+
+def count_solutions(cells: Sequence[int], limit: int = 2) -> int:
+    return BitBoard(cells).count_solutions(limit)
@@ -0,0 +1,77 @@
+# api/app/sudoku/transforms.py
+import random
+from typing import List, NamedTuple, Sequence, Tuple
+
+# Small bank of valid solution grids. New grids are derived from these by
+# validity-preserving transforms instead of being solved from scratch.
+GRID_BANK: Tuple[str, ...] = (
+    "371429586265813749498567123937645218124398657586271934749182365852736491613954872",
+    "679214538285736194143958276736182459451369827892475613514697382928543761367821945",
+    "156327498289654371743189562462875139538916724917243685391468257874532916625791843",
+    "561438297394572816827961534756843129243197685189256743638729451472315968915684372",
+)
+
+IDENTITY = tuple(range(9))
+
+
+class Transform(NamedTuple):
+    """A Sudoku symmetry: optional transpose, row/column order, digit relabelling.
+
+    ``rows[r]`` / ``cols[c]`` name the source row/column that lands at ``r`` /
+    ``c`` (after the transpose); ``digits[v]`` is the new label of digit ``v``
+    (``digits[0]`` is always 0 so blanks stay blank).
+    """
+
+    transpose: bool = False
+    rows: Tuple[int, ...] = IDENTITY
+    cols: Tuple[int, ...] = IDENTITY
+    digits: Tuple[int, ...] = tuple(range(10))
+
+    def source_index(self, i: int) -> int:
+        r, c = self.rows[i // 9], self.cols[i % 9]
+        return c * 9 + r if self.transpose else r * 9 + c
+
+    def apply(self, cells: Sequence[int]) -> List[int]:
+        digits = self.digits
+        return [digits[cells[self.source_index(i)]] for i in range(81)]
+
+    def apply_str(self, board: str) -> str:
+        return "".join(map(str, self.apply([int(ch) for ch in board])))
+
+    def inverse(self) -> "Transform":
+        rows, cols = [0] * 9, [0] * 9
+        for k in range(9):
+            rows[self.rows[k]] = k
+            cols[self.cols[k]] = k
+        digits = [0] * 10
+        for v in range(10):
+            digits[self.digits[v]] = v
+        if self.transpose:
+            # Undoing a transpose swaps which permutation acts on rows.
+            rows, cols = cols, rows
+        return Transform(self.transpose, tuple(rows), tuple(cols), tuple(digits))
+
+
+def _line_order(rng: random.Random) -> Tuple[int, ...]:
+    """Shuffle bands (or stacks), then the three lines inside each one."""
+    return tuple(
+        band * 3 + line
+        for band in rng.sample(range(3), 3)
+        for line in rng.sample(range(3), 3)
+    )
+
+
+def random_transform(rng: random.Random) -> Transform:
+    labels = rng.sample(range(1, 10), 9)
+    return Transform(
+        transpose=rng.random() < 0.5,
+        rows=_line_order(rng),
+        cols=_line_order(rng),
+        digits=(0, *labels),
+    )
+
+
+def derive_grid(rng: random.Random) -> List[int]:
+    """Return a fresh flat solution grid in O(81) from the bank."""
+    base = [int(ch) for ch in rng.choice(GRID_BANK)]
+    return random_transform(rng).apply(base)
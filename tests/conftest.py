@@ -1,22 +1,34 @@
 import pathlib
 import sys
+import tempfile
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from backend.app.database import Base, get_db
+from backend.app.database import Base, get_async_db, get_db
 from backend.app.main import app
+from backend.app.puzzle_pool import puzzle_pool
+from backend.app.settings import settings
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # project root
 
 
-TEST_DATABASE_URL = "sqlite+pysqlite:///:memory:"
+# A file, not :memory:, so the sync and async engines see the same database
+_db_dir = tempfile.TemporaryDirectory()
+TEST_DATABASE_PATH = pathlib.Path(_db_dir.name) / "test.sqlite3"
 engine = create_engine(
-    TEST_DATABASE_URL, connect_args={"check_same_thread": False}, future=True
+    f"sqlite+pysqlite:///{TEST_DATABASE_PATH}",
+    connect_args={"check_same_thread": False},
+    future=True,
 )
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}")
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -24,6 +36,7 @@ def create_test_schema():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    _db_dir.cleanup()
 
 
 def override_get_db():
@@ -34,10 +47,52 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+
+@pytest.fixture(autouse=True)
+def isolated_background_work(monkeypatch, tmp_path):
+    # No pool producer, no worker processes and no host-wide pool file: tests
+    # that need them turn them on themselves.
+    monkeypatch.setattr(settings, "puzzle_pool_enabled", False)
+    monkeypatch.setattr(settings, "compute_workers", 0)
+    monkeypatch.setattr(puzzle_pool, "path", str(tmp_path / "puzzle_pool.sqlite3"))
 
 
 @pytest.fixture()
 def client():
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture()
+def db_engine():
+    return engine
+
+
+@pytest.fixture()
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+async def async_db():
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+    # Connections belong to the test's event loop; drop them with it.
+    await async_engine.dispose()
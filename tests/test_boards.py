@@ -1,5 +1,23 @@
+import asyncio
+import base64
+import json
+import random
+
+from backend.app.crud import boards as crud
+from backend.app.settings import settings
+from backend.app.sudoku.codec import unpack_board, unpack_solution
+from backend.app.sudoku.generator import generate_puzzle
+from backend.app.sudoku.transforms import random_transform
+from tests.test_solver import HARD, HARD_SOLUTION
 from tests.utils import count_clues, is_board_str
 
+EASY = (
+    "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+)
+EASY_SOLUTION = (
+    "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+)
+
 
 def test_random_board_default_medium(client):
     r = client.get("/boards/random")
@@ -27,3 +45,218 @@ def test_create_and_get_board(client):
     fetched = r2.json()
     assert fetched["id"] == board_id
     assert fetched["public_id"] == "test-public-123"
+
+
+def test_create_board_rejects_non_ascii_digits(client):
+    for field, board in (("initial_board", EASY), ("solution_board", EASY_SOLUTION)):
+        payload = {
+            "public_id": "non-ascii-digit",
+            "difficulty": "easy",
+            "initial_board": EASY,
+            "solution_board": EASY_SOLUTION,
+            field: "\u0663" + board[1:],  # ARABIC-INDIC DIGIT THREE
+        }
+        r = client.post("/boards", json=payload)
+        assert r.status_code == 422
+        assert field in r.text
+
+
+def test_create_board_is_graded_and_filterable(client):
+    payload = {
+        "public_id": "graded-easy-1",
+        "difficulty": "easy",
+        "initial_board": EASY,
+        "solution_board": EASY_SOLUTION,
+    }
+    r = client.post("/boards", json=payload)
+    assert r.status_code == 200
+    created = r.json()
+    assert created["rating"] == 1
+    assert created["technique"] == "naked_single"
+    assert created["clue_count"] == 32
+    assert created["search_nodes"] == 0
+
+    r2 = client.get("/boards/random", params={"difficulty": "easy", "max_rating": 1})
+    assert r2.status_code == 200
+    assert r2.json()["rating"] <= 1
+    r3 = client.get("/boards/random", params={"difficulty": "easy", "min_rating": 8})
+    assert r3.status_code == 404
+
+
+def test_random_board_wraps_around_random_key(client, monkeypatch):
+    payload = {
+        "public_id": "random-key-hard-1",
+        "difficulty": "hard",
+        "initial_board": EASY,
+        "solution_board": EASY_SOLUTION,
+    }
+    assert client.post("/boards", json=payload).status_code == 200
+
+    # A pivot above every stored key must wrap to the smallest one.
+    monkeypatch.setattr(crud.random, "random", lambda: 1.0)
+    r = client.get("/boards/random", params={"difficulty": "hard"})
+    assert r.status_code == 200
+    assert r.json()["public_id"] == "random-key-hard-1"
+
+
+def test_boards_keyset_pages_and_ndjson_stream(client):
+    for k in range(3):
+        payload = {
+            "public_id": f"page-expert-{k}",
+            "difficulty": "expert",
+            "initial_board": EASY,
+            "solution_board": EASY_SOLUTION,
+        }
+        assert client.post("/boards", json=payload).status_code == 200
+
+    params = {"difficulty": "expert", "limit": 2}
+    first = client.get("/boards/page", params=params).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    second = client.get(
+        "/boards/page", params={**params, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(second["items"]) == 1 and second["next_cursor"] is None
+    paged = {b["public_id"] for b in first["items"] + second["items"]}
+    assert paged == {f"page-expert-{k}" for k in range(3)}
+
+    assert client.get("/boards/page", params={"cursor": "nope"}).status_code == 400
+
+    r = client.get("/boards/stream", params={"difficulty": "expert"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line)["public_id"] for line in r.text.splitlines()]
+    assert streamed == [b["public_id"] for b in first["items"] + second["items"]]
+
+
+def test_board_compact_format(client):
+    payload = {
+        "public_id": "compact-1",
+        "difficulty": "easy",
+        "initial_board": EASY,
+        "solution_board": EASY_SOLUTION,
+    }
+    board_id = client.post("/boards", json=payload).json()["id"]
+
+    r = client.get(f"/boards/{board_id}", params={"format": "compact"})
+    assert r.status_code == 200
+    data = r.json()
+    assert "initial_board" not in data
+    initial = base64.urlsafe_b64decode(data["initial_packed"])
+    solution = base64.urlsafe_b64decode(data["solution_packed"])
+    assert unpack_board(initial) == EASY
+    assert unpack_solution(solution) == EASY_SOLUTION
+
+    r = client.get("/boards/by-public/compact-1", params={"format": "compact"})
+    assert r.json()["initial_packed"] == data["initial_packed"]
+    assert client.get(f"/boards/{board_id}").json()["initial_board"] == EASY
+    assert (
+        client.get(f"/boards/{board_id}", params={"format": "xml"}).status_code == 422
+    )
+
+
+def test_equivalent_boards_link_or_reject(client, monkeypatch):
+    t = random_transform(random.Random(21))
+    puzzle, solution = t.apply_str(HARD), t.apply_str(HARD_SOLUTION)
+    first = client.post(
+        "/boards",
+        json={
+            "public_id": "canonical-1",
+            "difficulty": "hard",
+            "initial_board": HARD,
+            "solution_board": HARD_SOLUTION,
+        },
+    ).json()
+    payload = {
+        "public_id": "canonical-2",
+        "difficulty": "hard",
+        "initial_board": puzzle,
+        "solution_board": solution,
+    }
+
+    monkeypatch.setattr(settings, "board_duplicates", "reject")
+    r = client.post("/boards", json=payload)
+    assert r.status_code == 409
+
+    monkeypatch.setattr(settings, "board_duplicates", "link")
+    linked = client.post("/boards", json=payload).json()
+    assert linked["duplicate_of_id"] == (first["duplicate_of_id"] or first["id"])
+    assert linked["rating"] == first["rating"]
+    assert linked["search_nodes"] == first["search_nodes"]
+
+
+def test_bulk_create_reports_each_row(client, monkeypatch):
+    monkeypatch.setattr(settings, "board_duplicates", "reject")
+    puzzle, solution = generate_puzzle(4242, "easy")  # not stored by other tests
+    t = random_transform(random.Random(41))
+    other = random_transform(random.Random(42))
+
+    def row(public_id, transform, **overrides):
+        return {
+            "public_id": public_id,
+            "difficulty": "easy",
+            "initial_board": transform.apply_str(puzzle),
+            "solution_board": transform.apply_str(solution),
+            **overrides,
+        }
+
+    rows = [
+        row("bulk-1", t),
+        row("bulk-2", t, initial_board="1" * 80),  # fails BoardCreate
+        row("bulk-1", other),  # public_id taken earlier in the batch
+        row("bulk-3", other),  # equivalent to bulk-1
+        row("bulk-4", t, initial_board="0" * 81),
+    ]
+    r = client.post("/boards/bulk", json={"boards": rows})
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["inserted"], data["rejected"]) == (2, 3)
+    results = data["results"]
+    assert [res["index"] for res in results] == [0, 1, 2, 3, 4]
+    assert [res["id"] is not None for res in results] == [
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert "already exists" in results[2]["error"]
+    assert "equivalent to bulk-1" in results[3]["error"]
+
+    stored = client.get(f"/boards/{results[0]['id']}").json()
+    assert stored["public_id"] == "bulk-1"
+    assert stored["rating"] is not None
+
+
+def test_bulk_create_prepares_chunks_concurrently(client, monkeypatch):
+    monkeypatch.setattr(crud, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(crud, "PREPARE_BATCH_SIZE", 1)
+    monkeypatch.setattr(settings, "compute_workers", 3)
+    running, peak = 0, 0
+    run = crud.compute.run
+
+    async def spy(fn, *args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        try:
+            return await run(fn, *args)
+        finally:
+            running -= 1
+
+    monkeypatch.setattr(crud.compute, "run", spy)
+    rows = []
+    for k in range(6):
+        puzzle, solution = generate_puzzle(5100 + k, "medium")
+        rows.append(
+            {
+                "public_id": f"bulk-concurrent-{k}",
+                "difficulty": "medium",
+                "initial_board": puzzle,
+                "solution_board": solution,
+            }
+        )
+    r = client.post("/boards/bulk", json={"boards": rows})
+    assert r.json()["inserted"] == 6
+    assert [res["index"] for res in r.json()["results"]] == list(range(6))
+    assert peak == 3  # bounded by the workers, not one chunk at a time
@@ -0,0 +1,21 @@
+import random
+
+from backend.app.sudoku.canonical import canonical_form, map_solution
+from backend.app.sudoku.transforms import random_transform
+from tests.test_solver import HARD, HARD_SOLUTION
+
+
+def test_canonical_form_is_shared_by_equivalent_puzzles():
+    rng = random.Random(11)
+    canonical = canonical_form(HARD)
+    assert canonical.transform.apply_str(HARD) == canonical.board
+    for _ in range(5):
+        t = random_transform(rng)
+        other = canonical_form(t.apply_str(HARD))
+        assert other.board == canonical.board
+        assert other.hash == canonical.hash
+        assert map_solution(HARD_SOLUTION, canonical, other) == t.apply_str(
+            HARD_SOLUTION
+        )
+
+    assert canonical_form("0" * 81) is None  # below MIN_CLUES
@@ -0,0 +1,32 @@
+import pytest
+
+from backend.app.sudoku.codec import (
+    PACKED_BOARD_SIZE,
+    PACKED_SOLUTION_SIZE,
+    pack_board,
+    pack_solution,
+    unpack_board,
+    unpack_solution,
+)
+from tests.test_boards import EASY, EASY_SOLUTION
+
+
+def test_pack_round_trips_and_sizes():
+    packed = pack_board(EASY)
+    assert len(packed) == PACKED_BOARD_SIZE
+    assert unpack_board(packed) == EASY
+    assert unpack_board(pack_board("0" * 81)) == "0" * 81
+
+    solution = pack_solution(EASY_SOLUTION)
+    assert len(solution) == PACKED_SOLUTION_SIZE
+    assert unpack_solution(solution) == EASY_SOLUTION
+    assert unpack_solution(pack_solution("9" * 81)) == "9" * 81
+
+
+def test_pack_rejects_malformed_input():
+    with pytest.raises(ValueError):
+        pack_board("0" * 80)
+    with pytest.raises(ValueError):
+        pack_solution(EASY)  # blanks cannot be packed as a solution
+    with pytest.raises(ValueError):
+        unpack_board(b"\x00" * 40)
@@ -0,0 +1,132 @@
+import base64
+import uuid
+
+import pytest
+
+from backend.app.corpus import (
+    HEADER_SIZE,
+    RECORD,
+    BoardSource,
+    Corpus,
+    CorpusError,
+    iter_db_boards,
+    write_corpus,
+)
+from backend.app.models import Difficulty
+from backend.app.routers import boards as boards_router
+from backend.app.settings import settings
+from backend.app.sudoku.codec import unpack_board
+from backend.app.sudoku.generator import generate_puzzle
+
+
+def _sources():
+    sources = []
+    for k, (difficulty, rating) in enumerate(
+        [
+            (Difficulty.EASY, 1),
+            (Difficulty.EASY, 2),
+            (Difficulty.EASY, None),
+            (Difficulty.HARD, 5),
+        ]
+    ):
+        puzzle, solution = generate_puzzle(900 + k, difficulty)
+        sources.append(BoardSource(uuid.uuid4(), difficulty, puzzle, solution, rating))
+    return sources
+
+
+@pytest.fixture()
+def corpus_file(tmp_path):
+    path = str(tmp_path / "boards.corpus")
+    sources = _sources()
+    write_corpus(path, sources)
+    return path, sources
+
+
+def test_corpus_round_trip_and_index(corpus_file):
+    path, sources = corpus_file
+    corpus = Corpus()
+    corpus.open(path)
+    assert corpus.size == 4
+    assert corpus.counts()[Difficulty.EASY] == 3
+    for index, source in enumerate(sources):
+        record = corpus.record(index)
+        assert (record.id, record.difficulty, record.rating) == (
+            source.id,
+            source.difficulty,
+            source.rating,
+        )
+        assert record.initial_board == source.initial_board
+        assert record.solution_board == source.solution_board
+    with pytest.raises(IndexError):
+        corpus.record(4)
+
+    assert corpus.random_index(Difficulty.HARD) == 3
+    assert corpus.random_index(Difficulty.MASTER) is None
+    assert {corpus.random_index(Difficulty.EASY, min_rating=2) for _ in range(20)} == {
+        1
+    }
+    assert {corpus.random_index(Difficulty.EASY, max_rating=1) for _ in range(20)} == {
+        0
+    }
+    assert corpus.random_index(Difficulty.EASY, min_rating=3) is None
+    corpus.close()
+    assert not corpus.loaded
+
+
+def test_corpus_rejects_bad_files(tmp_path):
+    path = tmp_path / "bad.corpus"
+    path.write_bytes(b"nope" * 64)
+    with pytest.raises(CorpusError):
+        Corpus().open(str(path))
+    with pytest.raises(CorpusError):
+        write_corpus(str(tmp_path / "x.corpus"), reversed(_sources()))
+
+
+def test_corpus_built_from_db(client, db_engine, tmp_path):
+    puzzle, solution = generate_puzzle(4343, "medium")
+    payload = {
+        "public_id": "corpus-source-1",
+        "difficulty": "medium",
+        "initial_board": puzzle,
+        "solution_board": solution,
+    }
+    board_id = client.post("/boards", json=payload).json()["id"]
+
+    path = tmp_path / "db.corpus"
+    counts = write_corpus(str(path), iter_db_boards(db_engine))
+    corpus = Corpus()
+    corpus.open(str(path))
+    assert corpus.size == sum(counts.values())
+    assert path.stat().st_size == HEADER_SIZE + corpus.size * RECORD.size
+    records = [corpus.record(i) for i in range(corpus.size)]
+    assert [r.difficulty for r in records] == sorted(
+        (r.difficulty for r in records), key=list(Difficulty).index
+    )
+    (record,) = [r for r in records if str(r.id) == board_id]
+    assert (record.initial_board, record.solution_board) == (puzzle, solution)
+    corpus.close()
+
+
+def test_random_endpoint_serves_from_corpus(client, corpus_file, monkeypatch):
+    path, sources = corpus_file
+    corpus = Corpus()
+    corpus.open(path)
+    monkeypatch.setattr(boards_router, "corpus", corpus)
+    monkeypatch.setattr(settings, "boards_random_backend", "corpus")
+
+    r = client.get("/boards/random", params={"difficulty": "hard"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["index"] == 3 and body["id"] == str(sources[3].id)
+    assert body["initial_board"] == sources[3].initial_board
+
+    r = client.get("/boards/random", params={"difficulty": "easy", "format": "compact"})
+    packed = base64.urlsafe_b64decode(r.json()["initial_packed"])
+    assert unpack_board(packed) == sources[r.json()["index"]].initial_board
+
+    assert (
+        client.get("/boards/random", params={"difficulty": "master"}).status_code == 404
+    )
+    assert client.get("/boards/corpus/1").json()["rating"] == 2
+    assert client.get("/boards/corpus/9").status_code == 404
+    corpus.close()
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+from sqlalchemy import select
+
+from backend.app import models
+from backend.app.models import Difficulty
+from backend.app.sudoku.farm import (
+    DatabaseSink,
+    FileSink,
+    farm_chunk,
+    parse_target,
+    plan_tasks,
+    run,
+    seed_for,
+)
+
+
+def test_parse_target():
+    assert parse_target("Easy=12") == (Difficulty.EASY, 12)
+    for bad in ("easy", "easy=x", "nope=3", "hard=-1"):
+        with pytest.raises(Exception):
+            parse_target(bad)
+
+
+def test_seed_ranges_are_deterministic_and_disjoint():
+    easy = {seed_for(Difficulty.EASY, k) for k in range(100)}
+    hard = {seed_for(Difficulty.HARD, k) for k in range(100)}
+    assert not easy & hard
+    assert farm_chunk(Difficulty.EASY, [3, 4]) == farm_chunk(Difficulty.EASY, [3, 4])
+
+
+def test_plan_skips_done_seeds():
+    targets = {Difficulty.EASY: 5}
+    tasks = list(plan_tasks(targets, {"farm-easy-1", "farm-easy-3"}, chunk_size=2))
+    assert tasks == [(Difficulty.EASY, [0, 2]), (Difficulty.EASY, [4])]
+
+
+def test_file_run_resumes(tmp_path):
+    path = tmp_path / "farm.csv"
+    sink = FileSink(str(path))
+    out = io.StringIO()
+    assert run({Difficulty.EASY: 4}, sink, workers=2, chunk_size=2, out=out) == 4
+    assert run({Difficulty.EASY: 6}, sink, workers=2, chunk_size=2, out=out) == 2
+    rows = [line.split(",") for line in path.read_text().splitlines()]
+    assert sorted(r[3] for r in rows) == [f"farm-easy-{k}" for k in range(6)]
+    assert all(len(r[0]) == len(r[1]) == 81 and r[2] == "easy" for r in rows)
+    assert "easy 6/6 (100.0%)" in out.getvalue()
+
+
+def test_database_run_inserts_graded_rows(db_engine):
+    seed_base = 10_000
+    sink = DatabaseSink(db_engine)
+    targets = {Difficulty.MEDIUM: 3}
+    assert run(targets, sink, workers=1, seed_base=seed_base, out=io.StringIO()) == 3
+    assert run(targets, sink, workers=1, seed_base=seed_base, out=io.StringIO()) == 0
+
+    stmt = select(models.Board).where(models.Board.public_id.like("farm-medium-%"))
+    with db_engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    assert len(rows) == 3
+    assert all(r.rating is not None and r.puzzle_hash is not None for r in rows)
@@ -1,3 +1,20 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend.app.compute import compute
+from backend.app.crud import boards as crud
+from backend.app.main import app
+from backend.app.routers import games
+from backend.app.settings import settings
+from backend.app.solve_cache import solve_cache
+from backend.app.sudoku import solver
+from backend.app.sudoku.batch import to_array
+from backend.app.sudoku.transforms import random_transform
+from tests.test_boards import EASY, EASY_SOLUTION
+from tests.test_solver import HARD, HARD_SOLUTION
 from tests.utils import is_board_str
 
 
@@ -38,3 +55,250 @@ def test_games_validate_and_solve(client):
     vr2 = r4.json()
     assert vr2["valid"] is True
     assert vr2["complete"] is True
+
+
+def test_games_solve_batch(client):
+    hard = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+    boards = [{"puzzle": hard}, {"puzzle": "11" + "0" * 79}, {"puzzle": "0" * 81}]
+    r = client.post("/games/solve/batch", json={"boards": boards})
+    assert r.status_code == 200
+    solutions = r.json()["solutions"]
+    assert len(solutions) == 3
+    assert solutions[0].startswith("812753649")
+    assert solutions[1] is None
+    assert is_board_str(solutions[2])
+
+    r2 = client.post("/games/solve/batch", json={"boards": [{"puzzle": "123"}]})
+    assert r2.status_code == 422
+
+
+def test_games_new_and_solve_via_compute_pool(monkeypatch):
+    monkeypatch.setattr(settings, "compute_workers", 2)
+    with TestClient(app) as client:
+        assert compute.running
+        r = client.post("/games/new", json={"difficulty": "hard", "seed": 3})
+        assert r.status_code == 200
+        data = r.json()
+        r2 = client.post("/games/solve", json={"board": {"puzzle": data["puzzle"]}})
+    assert r2.status_code == 200
+    assert r2.json()["solution"] == data["solution"]
+
+
+def test_games_new_returns_503_when_nothing_can_be_served(client, monkeypatch):
+    # A zero node budget means no removal can be verified unique.
+    monkeypatch.setattr(settings, "generation_max_nodes", 0)
+    r = client.post("/games/new", json={"difficulty": "extreme", "seed": 1})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == str(settings.generation_retry_after)
+
+
+def test_games_validate_move_returns_conflict_delta(client):
+    puzzle = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+    r = client.post("/games/validate", json={"board": {"puzzle": puzzle}})
+    token = r.json()["token"]
+
+    r = client.post(
+        "/games/validate/move", json={"token": token, "index": 1, "value": 8}
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["added"] == [0, 1] and data["removed"] == []
+    assert data["full"] is False
+
+    r = client.post(
+        "/games/validate/move", json={"token": data["token"], "index": 1, "value": 0}
+    )
+    assert r.json()["removed"] == [0, 1]
+    assert r.json()["token"] == token
+
+    r = client.post(
+        "/games/validate/move", json={"token": "!!", "index": 0, "value": 1}
+    )
+    assert r.status_code == 400
+
+
+def test_games_ws_pushes_move_deltas(client):
+    puzzle = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+    with client.websocket_connect("/games/ws") as ws:
+        ws.send_text(puzzle)
+        assert ws.receive_json() == {
+            "added": [],
+            "removed": [],
+            "full": False,
+            "complete": False,
+        }
+        ws.send_bytes(bytes([1, 8]))
+        assert ws.receive_json()["added"] == [0, 1]
+        ws.send_text("1,0")
+        assert ws.receive_json()["removed"] == [0, 1]
+        ws.send_text("99,1")
+        assert "error" in ws.receive_json()
+
+    with client.websocket_connect("/games/ws") as ws:
+        ws.send_text("not a board")
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_text()
+
+
+def test_games_ws_closes_on_binary_board_frame(client):
+    with client.websocket_connect("/games/ws") as ws:
+        ws.send_bytes(b"0" * 81)
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_text()
+    assert exc.value.code == 1008
+
+    with client.websocket_connect("/games/ws") as ws:
+        ws.send_text(EASY)
+        ws.receive_json()
+        ws.send({"type": "websocket.receive"})  # neither text nor bytes
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_text()
+    assert exc.value.code == 1008
+
+
+def test_games_validate_batch(client):
+    solved = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+    boards = [{"puzzle": solved}, {"puzzle": "11" + "0" * 79}, {"puzzle": "0" * 81}]
+    r = client.post("/games/validate/batch", json={"boards": boards})
+    assert r.status_code == 200
+    assert r.json()["results"] == [
+        {"valid": True, "complete": True, "conflicts": []},
+        {"valid": False, "complete": False, "conflicts": [0, 1]},
+        {"valid": True, "complete": False, "conflicts": []},
+    ]
+
+    r = client.post("/games/validate/batch", json={"boards": [{"puzzle": "x" * 81}]})
+    assert r.status_code == 422
+
+
+def test_games_batch_rejects_rows_of_wrong_length(client):
+    # Same total length as two boards: every row must be checked on its own.
+    boards = [{"puzzle": "0" * 80}, {"puzzle": "0" * 82}]
+    for path in ("/games/solve/batch", "/games/validate/batch"):
+        r = client.post(path, json={"boards": boards})
+        assert r.status_code == 422
+        assert "boards[0].puzzle" in r.text
+
+    r = client.post(
+        "/games/validate/batch",
+        json={"boards": [{"puzzle": "0" * 81, "state": "0" * 80}]},
+    )
+    assert r.status_code == 422 and "boards[0].state" in r.text
+
+    with pytest.raises(ValueError, match="puzzle 1"):
+        to_array(["0" * 81, "0" * 80 + "x"])
+
+
+def test_games_solve_caches_results_and_unsolvable_boards(client):
+    solve_cache.clear()
+    hard = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+    before = solve_cache.stats()
+    for _ in range(2):
+        r = client.post(
+            "/games/solve", json={"board": {"puzzle": hard.replace("0", ".")}}
+        )
+        assert r.json()["solution"].startswith("812753649")
+        r = client.post("/games/solve", json={"board": {"puzzle": "11" + "0" * 79}})
+        assert r.status_code == 400
+    stats = client.get("/games/solve/cache").json()
+    assert stats["misses"] - before["misses"] == 2
+    assert stats["hits"] - before["hits"] == 2
+
+
+def test_games_solve_rejects_malformed_boards_before_lookups(client):
+    solve_cache.clear()
+    for puzzle in ("é" * 81, "1" * 80, "x" * 81):
+        r = client.post("/games/solve", json={"board": {"puzzle": puzzle}})
+        assert r.status_code == 400
+    assert client.get("/games/solve/cache").json()["size"] == 0
+
+
+def test_games_solve_uses_configured_engine(client, monkeypatch):
+    solve_cache.clear()
+    calls = []
+
+    def spy(cells, max_nodes=None):
+        calls.append(max_nodes)
+        return solve_dlx(cells, max_nodes)
+
+    solve_dlx = solver.ENGINES["dlx"]
+    monkeypatch.setitem(solver.ENGINES, "dlx", spy)
+    monkeypatch.setattr(settings, "solver_engine", "dlx")
+    t = random_transform(random.Random(77))  # a puzzle no other test stores
+    r = client.post("/games/solve", json={"board": {"puzzle": t.apply_str(HARD)}})
+    assert r.json()["solution"] == t.apply_str(HARD_SOLUTION)
+    assert calls[0] == settings.solve_quick_nodes
+
+
+def test_games_solve_uses_stored_solution(client, monkeypatch):
+    solve_cache.clear()
+    client.post(
+        "/boards",
+        json={
+            "public_id": "stored-solution",
+            "difficulty": "easy",
+            "initial_board": EASY,
+            "solution_board": EASY_SOLUTION,
+        },
+    )
+
+    def no_solver(state):
+        raise AssertionError("solver should not run for a stored puzzle")
+
+    monkeypatch.setattr(games, "solve_str", no_solver)
+    r = client.post("/games/solve", json={"board": {"puzzle": EASY}})
+    assert r.status_code == 200
+    assert r.json()["solution"] == EASY_SOLUTION
+
+
+def test_games_solve_maps_solution_from_equivalent_board(client, monkeypatch):
+    solve_cache.clear()
+    t = random_transform(random.Random(31))
+    client.post(
+        "/boards",
+        json={
+            "public_id": "equivalent-source",
+            "difficulty": "hard",
+            "initial_board": t.apply_str(HARD),
+            "solution_board": t.apply_str(HARD_SOLUTION),
+        },
+    )
+    monkeypatch.setattr(settings, "solve_quick_nodes", 1)
+    mapped = []
+    lookup = crud.get_equivalent_solution
+
+    async def spy(db, puzzle):
+        mapped.append(await lookup(db, puzzle))
+        return mapped[-1]
+
+    monkeypatch.setattr(crud, "get_equivalent_solution", spy)
+    other = random_transform(random.Random(32))
+    r = client.post("/games/solve", json={"board": {"puzzle": other.apply_str(HARD)}})
+    assert r.status_code == 200
+    assert r.json()["solution"] == other.apply_str(HARD_SOLUTION)
+    assert mapped == [other.apply_str(HARD_SOLUTION)]  # no full search needed
+
+
+def test_games_solve_ignores_stored_solutions_that_do_not_solve(client, monkeypatch):
+    solve_cache.clear()
+    t = random_transform(random.Random(41))
+    puzzle = t.apply_str(EASY)
+    wrong = "".join(ch if ch != "0" else "9" for ch in puzzle)  # keeps the givens
+    r = client.post(
+        "/boards",
+        json={
+            "public_id": "wrong-solution",
+            "difficulty": "easy",
+            "initial_board": puzzle,
+            "solution_board": wrong,
+        },
+    )
+    assert r.status_code == 200
+    r = client.post("/games/solve", json={"board": {"puzzle": puzzle}})
+    assert r.json()["solution"] == t.apply_str(EASY_SOLUTION)
+
+    # The mapped solution of an equivalent board is checked the same way.
+    monkeypatch.setattr(settings, "solve_quick_nodes", 1)
+    other = random_transform(random.Random(42))
+    r = client.post("/games/solve", json={"board": {"puzzle": other.apply_str(EASY)}})
+    assert r.json()["solution"] == other.apply_str(EASY_SOLUTION)
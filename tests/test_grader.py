@@ -0,0 +1,30 @@
+from backend.app.sudoku.grader import Technique, grade_puzzle
+
+EASY = (
+    "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+)
+X_WING = (
+    "100000569492056108056109240009640801064010000218035604040500016905061402621000005"
+)
+HARD = (
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+)
+
+
+def test_grade_singles_only_puzzle():
+    grade = grade_puzzle(EASY)
+    assert grade.technique == Technique.NAKED_SINGLE
+    assert grade.steps == EASY.count("0")
+    assert grade.clues == 81 - EASY.count("0")
+    assert grade.search_nodes == 0 and grade.solvable
+
+
+def test_grade_needs_x_wing():
+    assert grade_puzzle(X_WING).technique == Technique.X_WING
+
+
+def test_grade_falls_back_to_search():
+    grade = grade_puzzle(HARD)
+    assert grade.technique == Technique.SEARCH
+    assert grade.search_nodes > 0 and grade.solvable
+    assert grade_puzzle("11" + "0" * 79).solvable is False
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from backend.app.sudoku.batch import validate_batch
+from backend.app.sudoku.grid import Grid
+from backend.app.sudoku.moves import MoveTracker, decode_token, encode_token
+from tests.test_solver import HARD, HARD_SOLUTION
+
+
+def test_grid_round_trips_and_shares_bytes():
+    grid = Grid.from_str(HARD)
+    assert str(grid) == HARD
+    assert grid.clues == 81 - HARD.count("0")
+
+    raw = bytearray(bytes(grid))
+    view = Grid.from_bytes(raw)
+    view[1] = 1
+    assert raw[1] == 1  # same buffer, no copy
+
+    copy = grid.copy()
+    copy[1] = 1
+    assert grid[1] == 0 and copy != grid
+
+    with pytest.raises(ValueError):
+        Grid.from_str("x" * 81)
+
+
+def test_grid_masks_track_edits_and_duplicates():
+    grid = Grid.from_str("11" + "0" * 79)
+    assert grid.conflicts() == [0, 1]
+    assert not grid.is_safe(9, 1)  # column 0 already holds a 1
+
+    grid[1] = 0  # the other 1 still sits in row 0
+    assert grid.rows[0] == 1 << 1
+    assert grid.conflicts() == []
+    grid[0] = 0
+    assert grid.rows[0] == 0 and grid.is_safe(9, 1)
+
+    assert Grid.from_str(HARD_SOLUTION).is_full()
+    assert Grid.from_str(HARD_SOLUTION).conflicts() == []
+
+
+def test_move_tracker_matches_full_rescan():
+    rng = random.Random(7)
+    grid = Grid.from_str(HARD)
+    conflicts = set(grid.conflicts())
+    tracker = MoveTracker(decode_token(encode_token(grid)))
+    for _ in range(500):
+        index, value = rng.randrange(81), rng.randrange(10)
+        added, removed = tracker.apply(index, value)
+        conflicts = (conflicts | set(added)) - set(removed)
+        assert sorted(conflicts) == tracker.grid.conflicts()
+
+
+def test_validate_batch_matches_grid_conflicts():
+    rng = random.Random(3)
+    digits = "0000123456789"
+    states = ["".join(rng.choice(digits) for _ in range(81)) for _ in range(200)]
+    expected = [(g.conflicts(), g.is_full()) for g in map(Grid.from_str, states)]
+    assert validate_batch(states) == expected
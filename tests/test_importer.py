@@ -0,0 +1,72 @@
+import io
+
+import pytest
+from sqlalchemy import select
+
+from backend.app import models
+from backend.app.models import Difficulty
+from backend.app.sudoku.generator import generate_puzzle
+from backend.app.sudoku.grader import grade_puzzle
+from backend.app.sudoku.importer import difficulty_for_grade, import_lines, parse_line
+
+
+def test_parse_line_formats():
+    puzzle, solution = generate_puzzle(515, "medium")
+    dotted = puzzle.replace("0", ".")
+    assert parse_line(dotted, "x").initial_board == puzzle
+    row = parse_line(f"{dotted},{solution},hard\n", "x")
+    assert (row.solution_board, row.difficulty) == (solution, Difficulty.HARD)
+    assert parse_line(f"{puzzle}\t{solution}\t0.4", "x").difficulty is None
+    assert parse_line("  \n", "x") is None
+    assert parse_line("# comment", "x") is None
+    assert row.public_id == parse_line(puzzle, "x").public_id
+
+    with pytest.raises(ValueError, match="81 characters"):
+        parse_line("quizzes,solutions", "x")
+    wrong = ("2" if solution[0] != "2" else "3") + solution[1:]
+    with pytest.raises(ValueError, match="conflicts"):
+        parse_line(f"{solution} {wrong}", "x")
+
+
+def test_difficulty_for_grade():
+    assert difficulty_for_grade(40, 8) == Difficulty.EASY
+    assert difficulty_for_grade(30, 2) == Difficulty.MEDIUM
+    assert difficulty_for_grade(28, 1) == Difficulty.HARD
+    assert difficulty_for_grade(28, 2) == Difficulty.EXPERT
+    assert difficulty_for_grade(17, 5) == Difficulty.MASTER
+
+
+def test_generated_puzzles_import_under_their_own_difficulty():
+    for difficulty in Difficulty:
+        puzzle, _ = generate_puzzle(620, difficulty)
+        grade = grade_puzzle(puzzle)
+        assert difficulty_for_grade(grade.clues, grade.rating) == difficulty
+
+
+@pytest.mark.anyio
+async def test_import_streams_solves_and_dedupes(async_db):
+    boards = [generate_puzzle(7000 + k, "easy") for k in range(5)]
+    lines = [
+        "quizzes,solutions",
+        *(f"{p.replace('0', '.')},{s}" for p, s in boards[:3]),
+        *(p for p, _ in boards[3:]),  # solved by the importer
+        boards[0][0],  # same puzzle again
+        "9" * 81,  # unsolvable
+    ]
+    out = io.StringIO()
+    stats = await import_lines(
+        async_db, iter(lines), prefix="t24", chunk_size=3, out=out
+    )
+    assert (stats.lines, stats.inserted, stats.rejected) == (8, 5, 3)
+    assert "line 7: public_id" in out.getvalue()
+
+    stored = (
+        await async_db.scalars(
+            select(models.Board).where(models.Board.public_id.like("t24-%"))
+        )
+    ).all()
+    by_puzzle = {b.initial_board: b for b in stored}
+    for puzzle, solution in boards:
+        board = by_puzzle[puzzle]
+        assert board.solution_board == solution
+        assert board.rating is not None and board.difficulty == Difficulty.EASY
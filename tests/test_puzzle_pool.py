@@ -0,0 +1,38 @@
+import asyncio
+
+from backend.app.models import Difficulty
+from backend.app.puzzle_pool import PuzzlePool
+from backend.app.routers import games
+from backend.app.settings import settings
+
+
+def test_pool_push_pop_and_refill(tmp_path):
+    pool = PuzzlePool(str(tmp_path / "pool.sqlite3"))
+    pool.open()
+    assert pool.pop(Difficulty.EASY) is None
+
+    pool.push_many(Difficulty.EASY, [("a" * 81, "b" * 81), ("c" * 81, "d" * 81)])
+    assert pool.counts()[Difficulty.EASY] == 2
+    assert pool.pop(Difficulty.EASY) == ("a" * 81, "b" * 81)
+
+    added = asyncio.run(pool.refill(low_water=2, target=2))
+    counts = pool.counts()
+    assert added == 1 + 2 * (len(Difficulty) - 1)
+    assert all(count == 2 for count in counts.values())
+
+
+def test_games_new_serves_unseeded_requests_from_pool(client, tmp_path, monkeypatch):
+    pool = PuzzlePool(str(tmp_path / "pool.sqlite3"))
+    pool.open()
+    pool.push_many(Difficulty.EXPERT, [("1" + "0" * 80, "1" * 81)])
+    monkeypatch.setattr(games, "puzzle_pool", pool)
+    monkeypatch.setattr(settings, "puzzle_pool_enabled", True)
+
+    r = client.post("/games/new", json={"difficulty": "expert"})
+    assert r.status_code == 200
+    assert r.json()["puzzle"] == "1" + "0" * 80
+
+    # Pool is empty now: fall back to live generation.
+    r2 = client.post("/games/new", json={"difficulty": "expert"})
+    assert r2.status_code == 200
+    assert r2.json()["puzzle"] != "1" + "0" * 80
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.app import models
+from backend.app.crud import boards as crud
+from tests.utils import assert_index_only_plans, explain_queries
+
+SOLUTION = (
+    "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+)
+
+
+@pytest.fixture()
+def seeded_db(db):
+    for k in range(20):
+        db.add(
+            models.Board(
+                public_id=f"plan-{uuid.uuid4().hex[:8]}-{k}",
+                difficulty=list(models.Difficulty)[k % len(models.Difficulty)],
+                initial_board="0" * 81,
+                solution_board=SOLUTION,
+            )
+        )
+    db.commit()
+    return db
+
+
+@pytest.mark.anyio
+async def test_board_lookups_use_indexes(seeded_db, db_engine, async_db):
+    after = (datetime.now(timezone.utc), uuid.uuid4())
+    with explain_queries(db_engine, source=async_db.bind.sync_engine) as plans:
+        await crud.get_board_all(async_db)
+        await crud.get_board_all_by_level(async_db, models.Difficulty.EASY)
+        await crud.get_random_board(async_db, models.Difficulty.EASY)
+        await crud.get_board_page(async_db, 10)
+        await crud.get_board_page(async_db, 10, after, models.Difficulty.HARD)
+    assert_index_only_plans(plans)
@@ -0,0 +1,31 @@
+from backend.app.solve_cache import SolveCache, normalize_puzzle
+
+
+def test_solve_cache_lru_ttl_and_negative_entries():
+    now = [0.0]
+    cache = SolveCache(max_size=2, ttl=10, clock=lambda: now[0])
+
+    cache.store("a", "solved-a")
+    cache.store("b", None)  # unsolvable
+    assert cache.lookup("b") == (True, None)
+    assert cache.lookup("a") == (True, "solved-a")
+    cache.store("c", "solved-c")  # evicts b, the least recently used
+    assert cache.lookup("b") == (False, None)
+
+    now[0] = 10.0
+    assert cache.lookup("a") == (False, None)  # expired
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 2,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+    }
+
+
+def test_solve_cache_disabled_and_normalized_keys():
+    cache = SolveCache(max_size=0, ttl=10)
+    cache.store("a", "solved-a")
+    assert cache.lookup("a") == (False, None)
+    assert normalize_puzzle(" 1.3" + "0" * 78 + "\n") == "103" + "0" * 78
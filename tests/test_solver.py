@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from backend.app.settings import SOLVER_ENGINES, Settings
+from backend.app.sudoku import dlx, solver
+from backend.app.sudoku.batch import solve_batch
+from backend.app.sudoku.generator import (
+    from_str,
+    generate_full,
+    generate_puzzle,
+    generate_within,
+    solve_backtrack,
+    to_str,
+)
+from backend.app.sudoku.grader import grade_puzzle
+from backend.app.sudoku.solver import (
+    BitBoard,
+    BudgetExceeded,
+    count_solutions,
+    solve_cells,
+)
+from backend.app.sudoku.transforms import GRID_BANK, random_transform
+
+HARD = (
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+)
+HARD_SOLUTION = (
+    "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+)
+
+
+def test_solve_backtrack_hard_puzzle():
+    board = from_str(HARD)
+    assert solve_backtrack(board) is True
+    assert to_str(board) == HARD_SOLUTION
+
+
+def test_solve_backtrack_rejects_conflicting_givens():
+    board = from_str("11" + "0" * 79)
+    assert solve_backtrack(board) is False
+    assert to_str(board) == "11" + "0" * 79
+
+
+def test_count_solutions_stops_at_limit():
+    assert count_solutions([int(ch) for ch in HARD]) == 1
+    assert count_solutions([0] * 81, limit=2) == 2
+
+
+def test_engines_honour_node_budget():
+    cells = [int(ch) for ch in HARD]
+    for engine in ("bitmask", "dlx"):
+        with pytest.raises(BudgetExceeded):
+            solve_cells(cells, engine=engine, max_nodes=5)
+        # An interrupted DLX search still leaves the shared matrix intact.
+        assert solve_cells(cells, engine=engine, max_nodes=100_000) == [
+            int(ch) for ch in HARD_SOLUTION
+        ]
+
+
+def test_dlx_engine_matches_bitmask():
+    cells = [int(ch) for ch in HARD]
+    assert solve_cells(cells, engine="dlx") == solve_cells(cells, engine="bitmask")
+    # The preallocated matrix is restored after every call.
+    assert solve_cells(cells, engine="dlx") == [int(ch) for ch in HARD_SOLUTION]
+    assert dlx.count_solutions([0] * 81) == 2
+    assert solve_cells([1, 1] + [0] * 79, engine="dlx") is None
+
+
+def test_generate_puzzle_has_unique_solution():
+    puzzle, solution = generate_puzzle(7, "hard")
+    assert count_solutions([int(ch) for ch in puzzle]) == 1
+    assert sum(ch != "0" for ch in puzzle) == 28
+    assert all(p in ("0", s) for p, s in zip(puzzle, solution))
+
+
+def test_solve_batch_matches_single_solver():
+    puzzles = [generate_puzzle(seed, "medium")[0] for seed in range(20)]
+    puzzles.append(HARD)
+    expected = ["".join(map(str, solve_cells([int(ch) for ch in p]))) for p in puzzles]
+    assert solve_batch(puzzles) == expected
+    assert solve_batch([HARD_SOLUTION, "11" + "0" * 79]) == [HARD_SOLUTION, None]
+
+
+def test_transforms_preserve_validity_and_invert():
+    rng = random.Random(42)
+    for base in GRID_BANK:
+        cells = [int(ch) for ch in base]
+        assert count_solutions(cells) == 1
+        transform = random_transform(rng)
+        derived = transform.apply(cells)
+        assert BitBoard(derived).consistent and 0 not in derived
+        assert transform.inverse().apply(derived) == cells
+
+
+def test_generate_full_varies_with_seed():
+    assert generate_full(1) == generate_full(1)
+    assert generate_full(1) != generate_full(2)
+
+
+def test_generate_within_reports_actual_clues_under_budget():
+    result = generate_within(5, "extreme", max_nodes=50, max_attempts=3)
+    assert result.attempts == 3
+    assert result.clues == 81 - result.puzzle.count("0")
+    assert not result.reached_target
+    assert count_solutions([int(ch) for ch in result.puzzle]) == 1
+
+    unbounded = generate_within(5, "easy")
+    assert unbounded.reached_target and unbounded.attempts == 1
+
+
+def test_top_levels_have_disjoint_rating_ranges():
+    ranges = {}
+    levels = ("hard", "expert", "master", "extreme")
+    for difficulty in levels:
+        results = [generate_within(seed, difficulty) for seed in range(8)]
+        assert all(r.reached_target for r in results)
+        assert all(grade_puzzle(r.puzzle).rating == r.rating for r in results)
+        ranges[difficulty] = {r.rating for r in results}
+    for lower, higher in zip(levels, levels[1:]):
+        assert max(ranges[lower]) < min(ranges[higher])
+
+
+def test_settings_reject_unknown_solver_engine(monkeypatch):
+    assert set(SOLVER_ENGINES) == set(solver.ENGINES)
+    monkeypatch.setenv("APP_SOLVER_ENGINE", " DLX ")
+    assert Settings().solver_engine == "dlx"
+    monkeypatch.setenv("APP_SOLVER_ENGINE", "quantum")
+    with pytest.raises(ValueError, match="SOLVER_ENGINE"):
+        Settings()
@@ -1,6 +1,60 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
 def is_board_str(s: str) -> bool:
     return isinstance(s, str) and len(s) == 81 and all(ch.isdigit() for ch in s)
 
 
 def count_clues(puzzle: str) -> int:
     return sum(1 for ch in puzzle if ch != "0")
+
+
+@contextmanager
+def explain_queries(engine: Engine, table: str = "boards", source: Engine = None):
+    """Collect the query plan of every SELECT on ``table`` run inside the block.
+
+    Yields a list that is filled on exit with one list of plan lines per
+    statement, EXPLAINed with the parameters it actually ran with. Statements
+    are captured on ``source`` (e.g. an async engine's ``sync_engine``) when
+    given, and always EXPLAINed through the sync ``engine``.
+    """
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and table in statement:
+            captured.append((statement, parameters))
+
+    plans: list[list[str]] = []
+    source = source or engine
+    event.listen(source, "before_cursor_execute", capture)
+    try:
+        yield plans
+    finally:
+        event.remove(source, "before_cursor_execute", capture)
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            plans.append(_plan(conn, statement, parameters))
+
+
+def _plan(conn, statement, parameters) -> list[str]:
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[3] for row in rows]
+    # Postgres: tiny seeded tables make a seq scan cheapest, so forbid it and
+    # see whether an index path exists at all.
+    conn.exec_driver_sql("SET enable_seqscan = off")
+    rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+    return [row[0] for row in rows]
+
+
+def assert_index_only_plans(plans: list[list[str]], table: str = "boards"):
+    """Fail if any plan scans ``table`` sequentially or sorts outside an index."""
+    assert plans, "no queries were captured"
+    for lines in plans:
+        text = "\n".join(lines)
+        assert f"Seq Scan on {table}" not in text, text
+        assert not any(line.strip() == f"SCAN {table}" for line in lines), text
+        assert "TEMP B-TREE" not in text, text